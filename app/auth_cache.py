@@ -0,0 +1,159 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import redis
+import redis.asyncio
+
+from . import schemas
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TokenCache:
+    """Bounded TTL cache of verified access tokens and the user they resolve to.
+
+    Entries are keyed by a SHA-256 of the token, never outlive the token's
+    ``exp`` claim and are evicted least-recently-used when the cache is full.
+    Anything that changes or removes a user must await ``invalidate_user``.
+
+    Hits are answered from process memory without any I/O. With Redis
+    configured, ``invalidate_user`` publishes the user id and a background
+    thread in every worker evicts that user's entries as the message arrives.
+    Until that subscription is confirmed, and whenever it drops, the cache is
+    emptied and bypassed, so a missed invalidation can never be served.
+    """
+
+    channel = "auth:user-invalidated"
+
+    def __init__(self, maxsize: int, ttl: float, redis_url: str | None = None, retry_after: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation and subscription loss, so a user read
+        # before one of them is not cached after it
+        self._generation = 0
+        self._redis_url = redis_url or None
+        self._publisher = (
+            redis.asyncio.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5) if redis_url else None
+        )
+        # Without Redis the cache is process-local and always trusted
+        self._trusted = self._redis_url is None
+        self._listener = None
+        self._closed = threading.Event()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def generation(self) -> int:
+        """Read before loading a user and pass to ``put``."""
+        self._listen()
+        with self._lock:
+            return self._generation
+
+    def _listen(self):
+        # Started on first use rather than at import, so it runs in the worker process
+        if self._redis_url is None or self._listener is not None:
+            return
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._run_listener, name="token-cache-invalidations", daemon=True)
+                self._listener.start()
+
+    def _run_listener(self):
+        client = redis.Redis.from_url(
+            self._redis_url, socket_connect_timeout=0.5, socket_keepalive=True, health_check_interval=30,
+        )
+        while not self._closed.is_set():
+            pubsub = client.pubsub()
+            try:
+                pubsub.subscribe(self.channel)
+                while not self._closed.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is None:
+                        continue
+                    if message["type"] == "subscribe":
+                        # Anything published from here on reaches us
+                        with self._lock:
+                            self._trusted = True
+                    elif message["type"] == "message":
+                        self._evict_user(int(message["data"]))
+            except (redis.RedisError, ValueError) as e:
+                self._redis_failed(e)
+                self._closed.wait(self.retry_after)
+            finally:
+                pubsub.close()
+        client.close()
+
+    def _redis_failed(self, e: Exception):
+        logger.warning("Token cache bypassed until Redis is reachable: %s", e)
+        with self._lock:
+            self._trusted = False
+            self._generation += 1
+            self._entries.clear()
+
+    def _evict_user(self, user_id: int):
+        with self._lock:
+            self._generation += 1
+            for key in [key for key, (_, user) in self._entries.items() if user.id == user_id]:
+                del self._entries[key]
+
+    def get(self, token: str) -> schemas.User | None:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user
+
+    def put(self, token: str, exp: float | None, user, generation: int) -> schemas.User:
+        """Cache ``user``, unless an invalidation has arrived since ``generation`` was read."""
+        snapshot = schemas.User.model_validate(user)
+        expires_at = time.time() + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+        if self.maxsize <= 0:
+            return snapshot
+        key = self._key(token)
+        with self._lock:
+            if not self._trusted or generation != self._generation:
+                return snapshot
+            self._entries[key] = (expires_at, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return snapshot
+
+    async def invalidate_user(self, user_id: int):
+        self._evict_user(user_id)
+        if self._publisher is None:
+            return
+        try:
+            await self._publisher.publish(self.channel, user_id)
+        except redis.RedisError as e:
+            # Other workers keep their entries until the TTL
+            logger.warning("Could not publish token cache invalidation for user %s: %s", user_id, e)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def close(self):
+        """Stop the invalidation listener."""
+        self._closed.set()
+        if self._listener is not None:
+            self._listener.join()
+
+
+token_cache = TokenCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS, settings.REDIS_URL)
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import redis
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_url(url: str, params: dict | None = None) -> str:
+    """Canonical form of ``url`` + ``params``: lower-cased host, sorted query."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query.extend((key, str(value)) for key, value in (params or {}).items())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", urlencode(sorted(query)), ""))
+
+
+class LRUCache:
+    """In-process TTL cache that evicts the least recently used entry when full."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class PageCache:
+    """Cache of parsed scraper pages, keyed on the normalized upstream URL.
+
+    Entries live in Redis so every API and Celery worker shares them. A sorted
+    set of last-access times bounds the number of entries, evicting the least
+    recently used ones. When Redis cannot be reached the cache falls back to an
+    in-process LRU and retries Redis after ``retry_after`` seconds.
+    """
+
+    prefix = "scraper:page:"
+    index_key = "scraper:page-index"
+
+    def __init__(self, redis_url: str | None, maxsize: int, retry_after: float = 30.0):
+        self.maxsize = maxsize
+        self.retry_after = retry_after
+        self.local = LRUCache(maxsize)
+        self.hits = {}
+        self.misses = {}
+        self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5) if redis_url else None
+        self._redis_down_until = 0.0
+
+    def key(self, url: str, params: dict | None = None) -> str:
+        return self.prefix + hashlib.sha1(normalize_url(url, params).encode()).hexdigest()
+
+    def _backend(self):
+        if self._redis is not None and time.monotonic() >= self._redis_down_until:
+            return self._redis
+        return None
+
+    def _redis_failed(self, e: Exception):
+        logger.warning("Page cache falling back to in-process LRU: %s", e)
+        self._redis_down_until = time.monotonic() + self.retry_after
+
+    def _count(self, counters: dict, step: int):
+        counters[step] = counters.get(step, 0) + 1
+
+    def get(self, step: int, key: str):
+        value = None
+        backend = self._backend()
+        if backend is not None:
+            try:
+                pipe = backend.pipeline(transaction=False)
+                pipe.get(key)
+                pipe.zadd(self.index_key, {key: time.time()}, xx=True)
+                raw, _ = pipe.execute()
+                value = json.loads(raw) if raw is not None else None
+            except redis.RedisError as e:
+                self._redis_failed(e)
+                value = self.local.get(key)
+        else:
+            value = self.local.get(key)
+        self._count(self.hits if value is not None else self.misses, step)
+        return value
+
+    def set(self, key: str, value, ttl: int):
+        backend = self._backend()
+        if backend is None:
+            self.local.set(key, value, ttl)
+            return
+        try:
+            pipe = backend.pipeline(transaction=False)
+            pipe.set(key, json.dumps(value), ex=ttl)
+            pipe.zadd(self.index_key, {key: time.time()})
+            pipe.zcard(self.index_key)
+            size = pipe.execute()[-1]
+            if size > self.maxsize:
+                evicted = [member for member, _ in backend.zpopmin(self.index_key, size - self.maxsize)]
+                if evicted:
+                    backend.delete(*evicted)
+        except redis.RedisError as e:
+            self._redis_failed(e)
+            self.local.set(key, value, ttl)
+
+    def stats(self) -> dict:
+        steps = sorted(set(self.hits) | set(self.misses))
+        return {
+            "backend": "redis" if self._backend() is not None else "local",
+            "steps": {step: {"hits": self.hits.get(step, 0), "misses": self.misses.get(step, 0)} for step in steps},
+        }
+
+
+page_cache = PageCache(settings.REDIS_URL, settings.SCRAPER_CACHE_MAX_ENTRIES)
@@ -1,6 +1,8 @@
 from celery import Celery
 import os
 
+from .config import settings
+
 celery = Celery(
     __name__,
     broker=os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/0"),
@@ -13,4 +15,12 @@ celery.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    task_track_started=True,
+    include=["app.tasks"],
+    beat_schedule={
+        "resync-imported-teams": {
+            "task": "app.tasks.resync_teams",
+            "schedule": settings.RESYNC_INTERVAL_SECONDS,
+        },
+    },
 )
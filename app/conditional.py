@@ -0,0 +1,77 @@
+"""Weak ETags and Last-Modified validators for conditional GETs.
+
+Validators are built from ``updated_at`` values (the max over a page for
+lists) plus whatever else identifies the representation, such as row counts,
+so a 304 can be decided from a cheap aggregate query.
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+# Authenticated, per-user payloads: cache privately and always revalidate
+CACHE_CONTROL = "private, no-cache"
+
+
+@dataclass
+class Validator:
+    etag: str
+    last_modified: datetime | None
+
+    @classmethod
+    def build(cls, updated_at: datetime | None, *parts, dated: bool = True) -> "Validator":
+        """Validator for a representation last changed at ``updated_at``.
+
+        Pass ``dated=False`` when rows can leave the representation without
+        bumping any ``updated_at`` (deletes, unlinks): only the ETag, which
+        also covers ``parts``, is sent and If-Modified-Since is ignored.
+        """
+        # Timestamps are stored without a zone and written by the UTC database server
+        if updated_at is not None and updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        key = "|".join(str(part) for part in (updated_at.isoformat() if updated_at else "", *parts))
+        return cls(f'W/"{hashlib.md5(key.encode()).hexdigest()}"', updated_at if dated else None)
+
+    @property
+    def headers(self) -> dict:
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_fresh(request: Request, validator: Validator) -> bool:
+    """Whether the client's cached copy is current; If-None-Match wins over If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [_opaque(tag) for tag in if_none_match.split(",")]
+        return "*" in tags or _opaque(validator.etag) in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and validator.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # "-0000" and zoneless dates parse as naive; HTTP dates are always GMT
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return validator.last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified(validator: Validator) -> Response:
+    return Response(status_code=304, headers=validator.headers)
+
+
+def add_headers(response: Response, validator: Validator) -> Response:
+    response.headers.update(validator.headers)
+    return response
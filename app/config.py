@@ -2,10 +2,55 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     database_url: str
+    # Defaults to database_url with the asyncpg driver
+    async_database_url: str | None = None
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
     SECRET_KEY: str = "a_very_secret_key"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     ALGORITHM: str = "HS256"
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    BCRYPT_ROUNDS: int = 12
+    # Processes used for password hashing; defaults to the number of cores
+    PASSWORD_HASH_WORKERS: int | None = None
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 200
+    # pg_trgm word_similarity cut-off for name search; lower admits worse misspellings
+    SEARCH_SIMILARITY_THRESHOLD: float = 0.3
+    SEARCH_LIMIT_MAX: int = 50
+    # Rows fetched from the server-side cursor per export chunk
+    EXPORT_BATCH_SIZE: int = 1000
+    SCRAPER_BASE_URL: str = "https://www.tennisrecord.com"
+    SCRAPER_CONNECT_TIMEOUT: float = 5.0
+    SCRAPER_READ_TIMEOUT: float = 30.0
+    SCRAPER_MAX_ATTEMPTS: int = 3
+    SCRAPER_BACKOFF_SECONDS: float = 0.5
+    SCRAPER_BACKOFF_MAX_SECONDS: float = 8.0
+    SCRAPER_POOL_CONNECTIONS: int = 4
+    SCRAPER_POOL_MAXSIZE: int = 16
+    SCRAPER_REVALIDATE_CACHE_SIZE: int = 256
+    # Token bucket shared by all workers, per upstream host
+    SCRAPER_RATE_PER_SECOND: float = 2.0
+    SCRAPER_RATE_BURST: int = 5
+    # Longest a coalesced fetch may run before waiters stop waiting and fetch themselves
+    SCRAPER_SINGLE_FLIGHT_LEASE_SECONDS: float = 120.0
+    # How long a finished fetch's result stays readable for waiters
+    SCRAPER_SINGLE_FLIGHT_RESULT_TTL: int = 10
+    REDIS_URL: str | None = "redis://localhost:6379/1"
+    # Seconds to keep parsed wizard pages, per step; steps not listed are never cached
+    SCRAPER_CACHE_TTLS: dict[int, int] = {1: 86400, 2: 86400, 3: 86400, 4: 21600}
+    SCRAPER_CACHE_MAX_ENTRIES: int = 2048
+    # Players upserted per commit when step 6 streams its progress
+    SCRAPER_STREAM_BATCH_SIZE: int = 10
+    # How often Celery beat re-fetches the rosters of imported teams
+    RESYNC_INTERVAL_SECONDS: int = 21600
+    # Per-worker Celery rate limit for roster re-fetches
+    RESYNC_RATE_LIMIT: str = "30/m"
 
     class Config:
         pass
@@ -1,17 +1,31 @@
+import hashlib
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
-from . import models, schemas
+from . import models, projections, schemas
 
 def get_team_by_name(db: Session, name: str):
     return db.query(models.Team).filter(models.Team.name == name).first()
 
 def create_team(db: Session, team: schemas.TeamCreate):
-    db_team = models.Team(name=team.name)
+    db_team = models.Team(**team.model_dump())
     db.add(db_team)
     db.commit()
     db.refresh(db_team)
     return db_team
 
+def update_team(db: Session, db_team: models.Team, update_data: dict):
+    for key, value in update_data.items():
+        setattr(db_team, key, value)
+    db.commit()
+    db.refresh(db_team)
+    return db_team
+
+def get_synced_teams(db: Session):
+    return db.scalars(select(models.Team).where(models.Team.href.is_not(None)).order_by(models.Team.id)).all()
+
 def get_player_by_href(db: Session, href: str):
     return db.query(models.Player).filter(models.Player.href == href).first()
 
@@ -29,6 +43,87 @@ def update_player(db: Session, db_player: models.Player, player_update: schemas.
     db.refresh(db_player)
     return db_player
 
+def link_players_statement():
+    """Idempotent insert into ``player_team_association``; existing links are left alone."""
+    return insert(models.player_team_association).on_conflict_do_nothing()
+
 def add_player_to_team(db: Session, db_team: models.Team, db_player: models.Player):
-    db_team.players.append(db_player)
+    db.execute(link_players_statement().values(player_id=db_player.id, team_id=db_team.id))
     db.commit()
+
+def player_content_hash(row: dict) -> str:
+    # Must match the backfill in migration e3c9b0a5f6d1
+    fields = (row["name"], row["location"], row["ntrp"], row["rating"])
+    return hashlib.md5("\x1f".join(fields).encode()).hexdigest()
+
+def upsert_players_statement(rows: dict[str, dict]):
+    """``INSERT ... ON CONFLICT (href) DO UPDATE ... RETURNING`` for player rows keyed by href.
+
+    Rows whose content hash and gender are unchanged are not rewritten and
+    so are not returned.
+    """
+    # Insert in href order so concurrent imports lock rows in the same order
+    stmt = insert(models.Player).values([
+        {**rows[href], "content_hash": player_content_hash(rows[href])} for href in sorted(rows)
+    ])
+    return stmt.on_conflict_do_update(
+        index_elements=[models.Player.href],
+        set_={
+            "name": stmt.excluded.name,
+            "location": stmt.excluded.location,
+            "ntrp": stmt.excluded.ntrp,
+            "rating": stmt.excluded.rating,
+            "gender": stmt.excluded.gender,
+            "ntrp_value": stmt.excluded.ntrp_value,
+            "rating_value": stmt.excluded.rating_value,
+            "content_hash": stmt.excluded.content_hash,
+            "updated_at": func.now(),
+        },
+        # gender is not part of the hash (step 6 takes it from the request), so compare it too
+        where=or_(
+            models.Player.content_hash.is_distinct_from(stmt.excluded.content_hash),
+            models.Player.gender.is_distinct_from(stmt.excluded.gender),
+        ),
+    ).returning(*projections.PLAYER_COLUMNS)
+
+def unchanged_players_statement(rows: dict[str, dict], written):
+    """Select the rows of ``rows`` that the upsert skipped because nothing changed."""
+    unchanged = rows.keys() - {db_player.href for db_player in written}
+    if not unchanged:
+        return None
+    return select(*projections.PLAYER_COLUMNS).where(models.Player.href.in_(unchanged))
+
+def upsert_roster(db: Session, db_team: models.Team, players: list[schemas.PlayerCreate]):
+    """Upsert a parsed roster and link it to ``db_team`` in one transaction.
+
+    Players are written with a single ``INSERT ... ON CONFLICT (href) DO UPDATE
+    ... RETURNING`` that skips rows whose content hash is unchanged, and the
+    team links with one ``ON CONFLICT DO NOTHING`` bulk insert. Returns the
+    player rows in roster order and how many of them were written.
+    """
+    # ON CONFLICT cannot affect the same row twice, so keep the last row per href
+    rows = {player.href: player.model_dump() for player in players}
+    if not rows:
+        return [], 0
+
+    stmt = upsert_players_statement(rows)
+    try:
+        written = db.execute(stmt).all()
+        db_players = list(written)
+        unchanged = unchanged_players_statement(rows, written)
+        if unchanged is not None:
+            db_players.extend(db.execute(unchanged).all())
+        db.execute(
+            link_players_statement(),
+            [{"player_id": db_player.id, "team_id": db_team.id} for db_player in db_players],
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    order = {href: index for index, href in enumerate(rows)}
+    return sorted(db_players, key=lambda db_player: order[db_player.href]), len(written)
+
+def bulk_upsert_players(db: Session, db_team: models.Team, players: list[schemas.PlayerCreate]):
+    return upsert_roster(db, db_team, players)[0]
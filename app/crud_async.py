@@ -0,0 +1,224 @@
+"""Async counterparts of the ``crud`` helpers, for use with ``AsyncSession``."""
+from sqlalchemy import String, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from . import models, projections, schemas
+from .config import settings
+from .crud import link_players_statement, unchanged_players_statement, upsert_players_statement
+
+async def get_user(db: AsyncSession, user_id: int):
+    return await db.get(models.User, user_id)
+
+async def get_user_by_email(db: AsyncSession, email: str):
+    return await db.scalar(select(models.User).where(models.User.email == email))
+
+def _seek(model, stmt, cursor: int | None, limit: int):
+    # Seek past the last id seen instead of OFFSET, so every page costs the same.
+    # One extra row tells whether there is a next page.
+    if cursor is not None:
+        stmt = stmt.where(model.id > cursor)
+    return stmt.order_by(model.id).limit(limit + 1)
+
+async def keyset_page(db: AsyncSession, model, stmt, cursor: int | None, limit: int):
+    """One page of ``stmt``'s rows as dicts, plus the cursor for the next page."""
+    rows = (await db.execute(_seek(model, stmt, cursor, limit))).all()
+    next_cursor = rows[limit - 1].id if len(rows) > limit else None
+    return projections.as_dicts(rows[:limit]), next_cursor
+
+async def keyset_version(db: AsyncSession, model, stmt, cursor: int | None, limit: int):
+    """``(max updated_at, row count, id sum)`` of the page ``keyset_page`` would return.
+
+    Reads only ids and timestamps, so a conditional GET can be answered
+    without loading or serializing the page.
+    """
+    page = _seek(model, stmt.with_only_columns(model.id, model.updated_at), cursor, limit).subquery()
+    return (await db.execute(
+        select(func.max(page.c.updated_at), func.count(), func.coalesce(func.sum(page.c.id), 0))
+    )).one()
+
+def users_statement():
+    return select(*projections.USER_COLUMNS)
+
+async def get_user_version(db: AsyncSession, user_id: int):
+    return await db.scalar(select(models.User.updated_at).where(models.User.id == user_id))
+
+async def create_user(db: AsyncSession, user: schemas.UserCreate, hashed_password: str):
+    db_user = models.User(email=user.email, hashed_password=hashed_password, first_name=user.first_name, last_name=user.last_name, role=user.role)
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def update_user(db: AsyncSession, db_user: models.User, update_data: dict):
+    for key, value in update_data.items():
+        setattr(db_user, key, value)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def delete_user(db: AsyncSession, db_user: models.User):
+    await db.delete(db_user)
+    await db.commit()
+
+def teams_statement(name: str | None = None):
+    stmt = select(*projections.TEAM_COLUMNS)
+    if name is not None:
+        stmt = stmt.where(models.Team.name == name)
+    return stmt
+
+def filter_players(
+    stmt,
+    gender: str | None = None,
+    ntrp: str | None = None,
+    location: str | None = None,
+    team_name: str | None = None,
+):
+    """Apply the ``/players/`` filters to any select over ``players``."""
+    if gender is not None:
+        stmt = stmt.where(models.Player.gender == gender)
+    if ntrp is not None:
+        stmt = stmt.where(models.Player.ntrp == ntrp)
+    if location is not None:
+        stmt = stmt.where(models.Player.location == location)
+    if team_name is not None:
+        association = models.player_team_association
+        stmt = stmt.where(models.Player.id.in_(
+            select(association.c.player_id)
+            .join(models.Team, models.Team.id == association.c.team_id)
+            .where(models.Team.name == team_name)
+        ))
+    return stmt
+
+def players_statement(
+    gender: str | None = None,
+    ntrp: str | None = None,
+    location: str | None = None,
+    team_name: str | None = None,
+):
+    return filter_players(select(*projections.PLAYER_COLUMNS), gender=gender, ntrp=ntrp, location=location, team_name=team_name)
+
+def players_in_range_statement(gender: str, ntrp: float, rating_min: float | None = None, rating_max: float | None = None):
+    stmt = select(*projections.PLAYER_COLUMNS).where(models.Player.gender == gender, models.Player.ntrp_value == ntrp)
+    if rating_min is not None:
+        stmt = stmt.where(models.Player.rating_value >= rating_min)
+    if rating_max is not None:
+        stmt = stmt.where(models.Player.rating_value <= rating_max)
+    return stmt
+
+async def _related_version(db: AsyncSession, model, related_model, link_column, related_column, row_id: int):
+    # Latest change across the row and everything linked to it, plus the link count
+    association = models.player_team_association
+    return (await db.execute(
+        select(func.greatest(model.updated_at, func.max(related_model.updated_at)), func.count(related_model.id))
+        .select_from(model)
+        .outerjoin(association, link_column == model.id)
+        .outerjoin(related_model, related_model.id == related_column)
+        .where(model.id == row_id)
+        .group_by(model.id)
+    )).one_or_none()
+
+async def get_team_version(db: AsyncSession, team_id: int):
+    association = models.player_team_association
+    return await _related_version(db, models.Team, models.Player, association.c.team_id, association.c.player_id, team_id)
+
+async def get_player_version(db: AsyncSession, player_id: int):
+    association = models.player_team_association
+    return await _related_version(db, models.Player, models.Team, association.c.player_id, association.c.team_id, player_id)
+
+async def get_team_with_players(db: AsyncSession, team_id: int):
+    # One query for the team, one for its whole roster
+    return await db.scalar(
+        select(models.Team).options(selectinload(models.Team.players)).where(models.Team.id == team_id)
+    )
+
+async def get_player_with_teams(db: AsyncSession, player_id: int):
+    return await db.scalar(
+        select(models.Player).options(selectinload(models.Player.teams)).where(models.Player.id == player_id)
+    )
+
+async def _search_names(db: AsyncSession, model, columns: tuple, q: str, limit: int):
+    """Rank ``model`` rows by trigram word similarity of ``name`` to ``q``.
+
+    ``q <% name`` is answered from the pg_trgm GIN index; the threshold is set
+    per transaction so partial and misspelled names still match.
+    """
+    await db.execute(select(func.set_config(
+        "pg_trgm.word_similarity_threshold", str(settings.SEARCH_SIMILARITY_THRESHOLD), True,
+    )))
+    score = func.word_similarity(q, model.name)
+    stmt = (
+        select(*columns, score.label("score"))
+        .where(literal(q, String).op("<%")(model.name))
+        .order_by(score.desc(), func.similarity(q, model.name).desc(), model.id)
+        .limit(limit)
+    )
+    return projections.as_dicts((await db.execute(stmt)).all())
+
+async def search_players(db: AsyncSession, q: str, limit: int = 10):
+    return await _search_names(db, models.Player, projections.PLAYER_COLUMNS, q, limit)
+
+async def search_teams(db: AsyncSession, q: str, limit: int = 10):
+    return await _search_names(db, models.Team, projections.TEAM_COLUMNS, q, limit)
+
+async def get_team(db: AsyncSession, team_id: int):
+    return await db.get(models.Team, team_id)
+
+async def get_team_by_name(db: AsyncSession, name: str):
+    return await db.scalar(select(models.Team).where(models.Team.name == name).limit(1))
+
+async def create_team(db: AsyncSession, team: schemas.TeamCreate):
+    db_team = models.Team(**team.model_dump())
+    db.add(db_team)
+    await db.commit()
+    await db.refresh(db_team)
+    return db_team
+
+async def get_player_by_href(db: AsyncSession, href: str):
+    return await db.scalar(select(models.Player).where(models.Player.href == href))
+
+async def create_player(db: AsyncSession, player: schemas.PlayerCreate):
+    db_player = models.Player(**player.model_dump())
+    db.add(db_player)
+    await db.commit()
+    await db.refresh(db_player)
+    return db_player
+
+async def update_player(db: AsyncSession, db_player: models.Player, player_update: schemas.PlayerCreate):
+    for key, value in player_update.model_dump().items():
+        setattr(db_player, key, value)
+    await db.commit()
+    await db.refresh(db_player)
+    return db_player
+
+async def add_player_to_team(db: AsyncSession, db_team: models.Team, db_player: models.Player):
+    await db.execute(link_players_statement().values(player_id=db_player.id, team_id=db_team.id))
+    await db.commit()
+
+async def upsert_roster(db: AsyncSession, db_team: models.Team, players: list[schemas.PlayerCreate]):
+    """Async version of ``crud.upsert_roster``, built from the same statements."""
+    rows = {player.href: player.model_dump() for player in players}
+    if not rows:
+        return [], 0
+
+    stmt = upsert_players_statement(rows)
+    try:
+        written = (await db.execute(stmt)).all()
+        db_players = list(written)
+        unchanged = unchanged_players_statement(rows, written)
+        if unchanged is not None:
+            db_players.extend((await db.execute(unchanged)).all())
+        await db.execute(
+            link_players_statement(),
+            [{"player_id": db_player.id, "team_id": db_team.id} for db_player in db_players],
+        )
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    order = {href: index for index, href in enumerate(rows)}
+    return sorted(db_players, key=lambda db_player: order[db_player.href]), len(written)
+
+async def bulk_upsert_players(db: AsyncSession, db_team: models.Team, players: list[schemas.PlayerCreate]):
+    return (await upsert_roster(db, db_team, players))[0]
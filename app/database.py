@@ -1,11 +1,40 @@
 from sqlalchemy import create_engine, Column, DateTime
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from . import metrics
 from .config import settings
 from sqlalchemy.sql import func
 
-engine = create_engine(settings.database_url)
+pool_options = {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING,
+}
+
+engine = create_engine(
+    settings.database_url,
+    poolclass=metrics.timed_pool(QueuePool, "sync"),
+    connect_args={"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"},
+    **pool_options,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# The async stack talks to the same database through asyncpg
+async_database_url = settings.async_database_url or make_url(settings.database_url).set(drivername="postgresql+asyncpg")
+async_engine = create_async_engine(
+    async_database_url,
+    poolclass=metrics.timed_pool(AsyncAdaptedQueuePool, "async"),
+    connect_args={"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}},
+    **pool_options,
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+metrics.register_pool_gauges({"sync": engine, "async": async_engine})
+
 Base = declarative_base()
 
 class TimestampedBase(Base):
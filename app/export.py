@@ -0,0 +1,70 @@
+"""Streaming CSV/NDJSON exports backed by a server-side cursor.
+
+Rows are pulled from Postgres ``EXPORT_BATCH_SIZE`` at a time as plain
+tuples and written out batch by batch, so memory does not grow with the
+result size. The header is sent before the query runs.
+"""
+import csv
+import io
+
+import orjson
+from sqlalchemy import select
+
+from . import models
+from .config import settings
+from .database import AsyncSessionLocal
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+PLAYER_COLUMNS = (
+    models.Player.id,
+    models.Player.name,
+    models.Player.href,
+    models.Player.location,
+    models.Player.gender,
+    models.Player.ntrp,
+    models.Player.rating,
+    models.Player.ntrp_value,
+    models.Player.rating_value,
+    models.Player.updated_at,
+)
+
+
+def players_statement():
+    return select(*PLAYER_COLUMNS).order_by(models.Player.id)
+
+
+def team_players_statement(team_id: int):
+    association = models.player_team_association
+    return (
+        select(*PLAYER_COLUMNS)
+        .join(association, association.c.player_id == models.Player.id)
+        .where(association.c.team_id == team_id)
+        .order_by(models.Player.id)
+    )
+
+
+def _csv_chunk(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def _ndjson_chunk(names: list[str], rows) -> bytes:
+    return b"".join(orjson.dumps(dict(zip(names, row))) + b"\n" for row in rows)
+
+
+async def stream_rows(stmt, fmt: str):
+    """Yield ``stmt``'s rows encoded as ``fmt``, one chunk per fetched batch."""
+    names = [column.name for column in stmt.selected_columns]
+    if fmt == "csv":
+        yield _csv_chunk([names])
+
+    # The response outlives the request's dependencies, so use a dedicated session
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield _csv_chunk(rows) if fmt == "csv" else _ndjson_chunk(names, rows)
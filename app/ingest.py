@@ -0,0 +1,263 @@
+"""Bulk player/team ingest through ``COPY`` into a staging table.
+
+The upload is split into rows as it streams in, numbered, and copied into a
+temporary table with ``COPY FROM STDIN``, then merged into ``players``,
+``teams`` and ``player_team_association`` with a handful of set-based
+statements in one transaction. Rows that cannot be read are counted as
+rejected instead of failing the upload. Columns:
+
+    name, href, location, ntrp, rating, gender, team_name, team_href
+
+``name`` and ``href`` are required; a row with a ``team_name`` is linked to
+that team, which is created if no team of that name exists yet.
+"""
+import csv
+import io
+import json
+
+from sqlalchemy import text
+from sqlalchemy.exc import DataError
+
+from .database import async_engine
+
+COLUMNS = ("name", "href", "location", "ntrp", "rating", "gender", "team_name", "team_href")
+REQUIRED = ("name", "href")
+
+# Leading number of a display value, as in parsers.parse_number
+NUMBER = r"'^\s*(\d+(?:\.\d+)?)'"
+
+# A quoted field left open swallows the following lines until it reaches this size
+MAX_RECORD_BYTES = 65536
+
+# row_no is the row's position in the upload, so "last row wins" is well defined
+CREATE_STAGING = f"""
+    CREATE TEMP TABLE ingest_players (
+        row_no bigint,
+        {", ".join(f"{column} text" for column in COLUMNS)}
+    ) ON COMMIT DROP
+"""
+
+# Rows missing a key or with a value that would not fit numeric(2,1) /
+# numeric(5,4) once rounded are rejected. Every other row is kept for team
+# links; ``latest`` marks the last row per href, whose attributes the player takes
+CREATE_VALID = f"""
+    CREATE TEMP TABLE ingest_valid ON COMMIT DROP AS
+    SELECT row_no, name, href,
+        -- The API models treat these as required strings
+        coalesce(location, '') AS location, coalesce(ntrp, '') AS ntrp,
+        coalesce(rating, '') AS rating, coalesce(gender, '') AS gender,
+        team_name, team_href,
+        substring(ntrp from {NUMBER})::numeric AS ntrp_number,
+        substring(rating from {NUMBER})::numeric AS rating_number,
+        row_number() OVER (PARTITION BY href ORDER BY row_no DESC) = 1 AS latest
+    FROM ingest_players
+    WHERE nullif(name, '') IS NOT NULL AND nullif(href, '') IS NOT NULL
+      AND coalesce(round(substring(ntrp from {NUMBER})::numeric, 1), 0) < 10
+      AND coalesce(round(substring(rating from {NUMBER})::numeric, 4), 0) < 10
+"""
+
+MERGE_PLAYERS = """
+    WITH merged AS (
+        INSERT INTO players (name, href, location, ntrp, rating, gender, ntrp_value, rating_value, content_hash, created_at, updated_at)
+        SELECT name, href, location, ntrp, rating, gender, ntrp_number, rating_number,
+               md5(concat_ws(chr(31), name, location, ntrp, rating)), now(), now()
+        FROM ingest_valid
+        WHERE latest
+        ON CONFLICT (href) DO UPDATE SET
+            name = excluded.name,
+            location = excluded.location,
+            ntrp = excluded.ntrp,
+            rating = excluded.rating,
+            gender = excluded.gender,
+            ntrp_value = excluded.ntrp_value,
+            rating_value = excluded.rating_value,
+            content_hash = excluded.content_hash,
+            updated_at = now()
+        WHERE players.content_hash IS DISTINCT FROM excluded.content_hash
+           OR players.gender IS DISTINCT FROM excluded.gender
+        RETURNING xmax = 0 AS inserted
+    )
+    SELECT
+        (SELECT count(*) FROM ingest_players) AS received,
+        (SELECT count(*) FROM ingest_valid) AS accepted,
+        (SELECT count(*) FILTER (WHERE latest) FROM ingest_valid) AS distinct_players,
+        count(*) FILTER (WHERE inserted) AS inserted,
+        count(*) FILTER (WHERE NOT inserted) AS updated
+    FROM merged
+"""
+
+MERGE_TEAMS = """
+    WITH new_teams AS (
+        INSERT INTO teams (name, href, gender, created_at, updated_at)
+        SELECT DISTINCT ON (team_name) team_name, nullif(team_href, ''), gender, now(), now()
+        FROM ingest_valid
+        WHERE nullif(team_name, '') IS NOT NULL
+        ORDER BY team_name, row_no DESC
+        -- Teams created meanwhile by another import or the scraper are kept as they are
+        ON CONFLICT (name) DO NOTHING
+        RETURNING 1
+    )
+    SELECT count(*) FROM new_teams
+"""
+
+# A player listed on several teams is linked to each of them
+MERGE_LINKS = """
+    WITH new_links AS (
+        INSERT INTO player_team_association (player_id, team_id)
+        SELECT DISTINCT p.id, t.id
+        FROM ingest_valid v
+        JOIN players p ON p.href = v.href
+        JOIN teams t ON t.name = v.team_name
+        ON CONFLICT DO NOTHING
+        RETURNING 1
+    )
+    SELECT count(*) FROM new_links
+"""
+
+
+class IngestError(Exception):
+    """Raised when an upload cannot be read or copied into the staging table."""
+
+
+async def _lines(chunks):
+    """Re-chunk a byte stream into complete lines."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line + b"\n"
+    if pending.strip():
+        yield pending + b"\n"
+
+
+async def _csv_rows(lines, width: int, rejected: list):
+    """Parse CSV records of ``width`` fields, counting the ones that cannot be read.
+
+    A quoted field may span lines, so a record whose quote is still open is
+    completed from the following lines, up to ``MAX_RECORD_BYTES``.
+    """
+    pending = ""
+    async for line in lines:
+        try:
+            pending += line.decode("utf-8")
+        except UnicodeDecodeError:
+            rejected[0] += 1
+            pending = ""
+            continue
+        try:
+            row = next(csv.reader([pending], strict=True), [])
+        except csv.Error as e:
+            if "unexpected end of data" in str(e) and len(pending) < MAX_RECORD_BYTES:
+                continue
+            row = None
+        record, pending = row, ""
+        if record == []:
+            continue
+        if record is None or len(record) != width:
+            rejected[0] += 1
+            continue
+        yield record
+    if pending:
+        # A quote left open at the end of the upload
+        rejected[0] += 1
+
+
+async def _csv_source(chunks, rejected: list):
+    """Read and check the CSV header; returns its columns and the remaining rows."""
+    lines = _lines(chunks)
+    header = await anext(lines, None)
+    if header is None:
+        raise IngestError("Upload is empty")
+    try:
+        header = header.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise IngestError("CSV header is not UTF-8")
+    names = [name.strip() for name in next(csv.reader([header]), [])]
+    unknown = set(names) - set(COLUMNS)
+    if unknown:
+        raise IngestError(f"Unknown CSV columns: {', '.join(sorted(unknown))}")
+    if not set(REQUIRED) <= set(names):
+        raise IngestError(f"CSV header must include {', '.join(REQUIRED)}")
+    return names, _csv_rows(lines, len(names), rejected)
+
+
+async def _ndjson_source(chunks, rejected: list):
+    """Yield NDJSON objects as rows in ``COLUMNS`` order, counting lines that are not objects."""
+    async for line in _lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            rejected[0] += 1
+            continue
+        if not isinstance(record, dict):
+            rejected[0] += 1
+            continue
+        yield [None if record.get(column) is None else str(record[column]) for column in COLUMNS]
+
+
+async def _numbered_csv(rows):
+    """Encode rows as CSV for ``COPY``, each prefixed with its position in the upload."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    row_no = 0
+    async for row in rows:
+        row_no += 1
+        writer.writerow([row_no, *row])
+        if buffer.tell() >= 65536:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def ingest(chunks, fmt: str) -> dict:
+    """Copy an async iterable of CSV or NDJSON bytes into the database.
+
+    Returns counts of received, inserted, updated, unchanged, duplicate and
+    rejected player rows plus the teams and team links created.
+    """
+    unreadable = [0]
+    if fmt == "csv":
+        columns, rows = await _csv_source(chunks, unreadable)
+    else:
+        columns, rows = list(COLUMNS), _ndjson_source(chunks, unreadable)
+
+    async with async_engine.connect() as conn:
+        async with conn.begin():
+            # Large uploads are expected to outlast the default statement timeout
+            await conn.execute(text("SET LOCAL statement_timeout = 0"))
+            await conn.execute(text(CREATE_STAGING))
+            raw = await conn.get_raw_connection()
+            try:
+                # COPY pulls from the generator as the upload arrives
+                await raw.driver_connection.copy_to_table(
+                    "ingest_players", source=_numbered_csv(rows), columns=["row_no", *columns], format="csv",
+                )
+            except IngestError:
+                raise
+            except Exception as e:
+                raise IngestError(f"Could not copy upload: {e}")
+
+            try:
+                await conn.execute(text(CREATE_VALID))
+                counts = (await conn.execute(text(MERGE_PLAYERS))).one()
+                teams = (await conn.execute(text(MERGE_TEAMS))).scalar()
+                links = (await conn.execute(text(MERGE_LINKS))).scalar()
+            except DataError as e:
+                raise IngestError(f"Could not merge upload: {e.orig}")
+
+    received = counts.received + unreadable[0]
+    return {
+        "received": received,
+        "inserted": counts.inserted,
+        "updated": counts.updated,
+        "unchanged": counts.distinct_players - counts.inserted - counts.updated,
+        "duplicates": counts.accepted - counts.distinct_players,
+        "rejected": received - counts.accepted,
+        "teams_inserted": teams,
+        "links_inserted": links,
+    }
@@ -1,35 +1,32 @@
-from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import models, schemas
-import app.models
-from app.database import SessionLocal, engine
-from app.security import create_access_token, get_password_hash, verify_password
+from app.database import AsyncSessionLocal, SessionLocal, engine
+from app.security import create_access_token, get_password_hash_async, verify_and_update_password_async
 from jose import JWTError, jwt
 from app.config import settings
-from app import crud
-import requests
-from bs4 import BeautifulSoup
+from app import crud_async
+from app.auth_cache import token_cache
+import time
 
 
 
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
+from app import conditional, export, ingest, metrics
+from app.metrics import MetricsMiddleware
 
-app = FastAPI()
+router = APIRouter()
+
+metrics.registry.register(metrics.CeleryMetrics())
 
 origins = [
     "http://192.168.200.116:3030",
 ]
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # Dependency
@@ -41,7 +38,17 @@ def get_db():
         db.close()
 
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_current_user(db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)):
+    generation = token_cache.generation()
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -55,23 +62,28 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
         token_data = schemas.TokenData(email=email)
     except JWTError:
         raise credentials_exception
-    user = db.query(models.User).filter(models.User.email == token_data.email).first()
+    user = await crud_async.get_user_by_email(db, email=token_data.email)
     if user is None:
         raise credentials_exception
-    return user
+    return token_cache.put(token, payload.get("exp"), user, generation)
 
 
 from datetime import timedelta
 
-@app.post("/token", response_model=schemas.TokenWithUser, tags=["Auth"])
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+@router.post("/token", response_model=schemas.TokenWithUser, tags=["Auth"])
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    user = await crud_async.get_user_by_email(db, email=form_data.username)
+    verified, new_hash = await verify_and_update_password_async(form_data.password, user.hashed_password) if user else (False, None)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        user = await crud_async.update_user(db, user, {"hashed_password": new_hash})
+        # The write bumped updated_at, which cached snapshots and the /users/me ETag are built from
+        await token_cache.invalidate_user(user.id)
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         subject=user.email, expires_delta=access_token_expires
@@ -85,8 +97,8 @@ def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db:
 
 
 
-@app.post("/refresh", response_model=schemas.Token, tags=["Auth"])
-def refresh_access_token(refresh_token_data: schemas.RefreshToken, db: Session = Depends(get_db)):
+@router.post("/refresh", response_model=schemas.Token, tags=["Auth"])
+async def refresh_access_token(refresh_token_data: schemas.RefreshToken, db: AsyncSession = Depends(get_async_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -100,7 +112,7 @@ def refresh_access_token(refresh_token_data: schemas.RefreshToken, db: Session =
         token_data = schemas.TokenData(email=email)
     except JWTError:
         raise credentials_exception
-    user = db.query(models.User).filter(models.User.email == token_data.email).first()
+    user = await crud_async.get_user_by_email(db, email=token_data.email)
     if user is None:
         raise credentials_exception
 
@@ -111,278 +123,305 @@ def refresh_access_token(refresh_token_data: schemas.RefreshToken, db: Session =
     return {"access_token": access_token, "refresh_token": refresh_token_data.refresh_token, "token_type": "bearer"}
 
 
-def get_current_admin_user(current_user: models.User = Depends(get_current_user)):
+async def get_current_admin_user(current_user: models.User = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not enough permissions")
     return current_user
 
 
-@app.post("/users/", response_model=schemas.User, tags=["Users"])
-def create_user(user: schemas.UserCreate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_admin_user)):
-    db_user = db.query(models.User).filter(models.User.email == user.email).first()
+@router.post("/users/", response_model=schemas.User, tags=["Users"])
+async def create_user(user: schemas.UserCreate, db: AsyncSession = Depends(get_async_db), current_user: models.User = Depends(get_current_admin_user)):
+    db_user = await crud_async.get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    hashed_password = get_password_hash(user.password)
-    db_user = models.User(email=user.email, hashed_password=hashed_password, first_name=user.first_name, last_name=user.last_name, role=user.role)
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    hashed_password = await get_password_hash_async(user.password)
+    return await crud_async.create_user(db, user=user, hashed_password=hashed_password)
 
 
-@app.get("/users/me", response_model=schemas.User, tags=["Users"])
-def read_users_me(current_user: models.User = Depends(get_current_user)):
+@router.get("/users/me", response_model=schemas.User, tags=["Users"])
+async def read_users_me(request: Request, response: Response, current_user: models.User = Depends(get_current_user)):
+    validator = conditional.Validator.build(current_user.updated_at, current_user.id)
+    if conditional.is_fresh(request, validator):
+        return conditional.not_modified(validator)
+    conditional.add_headers(response, validator)
     return current_user
 
 
-@app.get("/users/", response_model=list[schemas.User], tags=["Users"])
-def read_users(db: Session = Depends(get_db), current_user: models.User = Depends(get_current_admin_user)):
-    users = db.query(models.User).all()
-    return users
+async def page_response(request: Request, db: AsyncSession, model, stmt, cursor: int | None, limit: int):
+    """One keyset page as JSON, or a 304 if the client already holds it."""
+    updated_at, count, id_sum = await crud_async.keyset_version(db, model, stmt, cursor, limit)
+    validator = conditional.Validator.build(updated_at, count, id_sum, limit, dated=False)
+    if conditional.is_fresh(request, validator):
+        return conditional.not_modified(validator)
+    items, next_cursor = await crud_async.keyset_page(db, model, stmt, cursor, limit)
+    return conditional.add_headers(ORJSONResponse({"items": items, "next_cursor": next_cursor}), validator)
+
 
+@router.get("/users/", response_model=schemas.UserPage, tags=["Users"])
+async def read_users(
+    request: Request,
+    cursor: int | None = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_admin_user),
+):
+    return await page_response(request, db, models.User, crud_async.users_statement(), cursor, limit)
 
-@app.get("/users/{user_id}", response_model=schemas.User, tags=["Users"])
-def read_user(user_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_admin_user)):
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
+
+@router.get("/users/{user_id}", response_model=schemas.User, tags=["Users"])
+async def read_user(user_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db), current_user: models.User = Depends(get_current_admin_user)):
+    updated_at = await crud_async.get_user_version(db, user_id=user_id)
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    validator = conditional.Validator.build(updated_at, user_id)
+    if conditional.is_fresh(request, validator):
+        return conditional.not_modified(validator)
+    db_user = await crud_async.get_user(db, user_id=user_id)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
+    conditional.add_headers(response, validator)
     return db_user
 
 
-@app.put("/users/{user_id}", response_model=schemas.User, tags=["Users"])
-def update_user(user_id: int, user: schemas.UserUpdate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_admin_user)):
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
+@router.put("/users/{user_id}", response_model=schemas.User, tags=["Users"])
+async def update_user(user_id: int, user: schemas.UserUpdate, db: AsyncSession = Depends(get_async_db), current_user: models.User = Depends(get_current_admin_user)):
+    db_user = await crud_async.get_user(db, user_id=user_id)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     
-    update_data = user.dict(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_user, key, value)
-    
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    db_user = await crud_async.update_user(db, db_user, user.dict(exclude_unset=True))
+    await token_cache.invalidate_user(user_id)
     return db_user
 
 
-@app.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["Users"])
-def delete_user(user_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_admin_user)):
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
+@router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["Users"])
+async def delete_user(user_id: int, db: AsyncSession = Depends(get_async_db), current_user: models.User = Depends(get_current_admin_user)):
+    db_user = await crud_async.get_user(db, user_id=user_id)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     
-    db.delete(db_user)
-    db.commit()
+    await crud_async.delete_user(db, db_user)
+    await token_cache.invalidate_user(user_id)
     return {"detail": "User deleted"}
 
-@app.get("/", tags=["Default"])
+@router.get("/players/", response_model=schemas.PlayerPage, tags=["Players"])
+async def read_players(
+    request: Request,
+    gender: str | None = None,
+    ntrp: str | None = None,
+    location: str | None = None,
+    team_name: str | None = None,
+    cursor: int | None = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Players in id order, one keyset page at a time.
+
+    Any combination of ``gender``, ``ntrp`` and ``location`` is served from an
+    index ending in ``id``. ``team_name`` limits the page to one roster, which
+    is read through the team's player links and sorted in memory.
+    """
+    stmt = crud_async.players_statement(gender=gender, ntrp=ntrp, location=location, team_name=team_name)
+    return await page_response(request, db, models.Player, stmt, cursor, limit)
+
+
+@router.get("/players/range", response_model=schemas.PlayerPage, tags=["Players"])
+async def read_players_in_range(
+    request: Request,
+    gender: str,
+    ntrp: float,
+    rating_min: float | None = None,
+    rating_max: float | None = None,
+    cursor: int | None = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    stmt = crud_async.players_in_range_statement(gender=gender, ntrp=ntrp, rating_min=rating_min, rating_max=rating_max)
+    return await page_response(request, db, models.Player, stmt, cursor, limit)
+
+
+def export_response(stmt, fmt: str, filename: str):
+    return StreamingResponse(
+        export.stream_rows(stmt, fmt),
+        media_type=export.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
+
+
+@router.get("/players/export", tags=["Players"])
+async def export_players(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    gender: str | None = None,
+    ntrp: str | None = None,
+    location: str | None = None,
+    team_name: str | None = None,
+    current_user: models.User = Depends(get_current_user),
+):
+    stmt = crud_async.filter_players(export.players_statement(), gender=gender, ntrp=ntrp, location=location, team_name=team_name)
+    return export_response(stmt, format, "players")
+
+
+@router.get("/players/search", response_model=list[schemas.PlayerMatch], tags=["Players"])
+async def search_players(
+    q: str = Query(..., min_length=2),
+    limit: int = Query(10, ge=1, le=settings.SEARCH_LIMIT_MAX),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    return ORJSONResponse(await crud_async.search_players(db, q=q, limit=limit))
+
+
+@router.post("/players/import", response_model=schemas.IngestResult, tags=["Players"])
+async def import_players(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    current_user: models.User = Depends(get_current_admin_user),
+):
+    try:
+        return await ingest.ingest(request.stream(), format)
+    except ingest.IngestError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/players/{player_id}", response_model=schemas.Player, tags=["Players"])
+async def read_player(player_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db), current_user: models.User = Depends(get_current_user)):
+    version = await crud_async.get_player_version(db, player_id=player_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    validator = conditional.Validator.build(*version, player_id, dated=False)
+    if conditional.is_fresh(request, validator):
+        return conditional.not_modified(validator)
+    db_player = await crud_async.get_player_with_teams(db, player_id=player_id)
+    if db_player is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    conditional.add_headers(response, validator)
+    return db_player
+
+
+@router.get("/teams/", response_model=schemas.TeamPage, tags=["Teams"])
+async def read_teams(
+    request: Request,
+    name: str | None = None,
+    cursor: int | None = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    return await page_response(request, db, models.Team, crud_async.teams_statement(name=name), cursor, limit)
+
+@router.get("/teams/search", response_model=list[schemas.TeamMatch], tags=["Teams"])
+async def search_teams(
+    q: str = Query(..., min_length=2),
+    limit: int = Query(10, ge=1, le=settings.SEARCH_LIMIT_MAX),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    return ORJSONResponse(await crud_async.search_teams(db, q=q, limit=limit))
+
+@router.get("/teams/{team_id}", response_model=schemas.Team, tags=["Teams"])
+async def read_team(team_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db), current_user: models.User = Depends(get_current_user)):
+    version = await crud_async.get_team_version(db, team_id=team_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    validator = conditional.Validator.build(*version, team_id, dated=False)
+    if conditional.is_fresh(request, validator):
+        return conditional.not_modified(validator)
+    db_team = await crud_async.get_team_with_players(db, team_id=team_id)
+    if db_team is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    conditional.add_headers(response, validator)
+    return db_team
+
+@router.get("/teams/{team_id}/export", tags=["Teams"])
+async def export_team(
+    team_id: int,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    if await crud_async.get_team(db, team_id=team_id) is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return export_response(export.team_players_statement(team_id), format, f"team-{team_id}")
+
+@router.get("/", tags=["Default"])
 def read_root():
     return {"message": "Welcome to the Task-Centric Backend!"}
 
-@app.post("/scraper", tags=["Scraper"])
-def scrape_url(scraper_request: schemas.ScraperRequest, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_admin_user)):
-    if scraper_request.step == 1:
-        payload = scraper_request.payload
-        year = payload.get("year")
-        lt = payload.get("lt")
-        sectionname = payload.get("sectionname")
-
-        if not all([year, lt, sectionname]):
-            raise HTTPException(status_code=400, detail="Missing required parameters for step 1")
-
-        params = {
-            "year": year,
-            "lt": lt,
-            "sectionname": sectionname
-        }
-        url = "https://www.tennisrecord.com/adult/league/leaguedistrict.aspx"
-        try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            raise HTTPException(status_code=400, detail=f"Could not fetch URL: {e}")
-
-        soup = BeautifulSoup(response.content, "lxml")
-        
-        districts = []
-        for a in soup.select('a[href*="leaguearea.aspx"]'):
-            districts.append({"text": a.text, "href": a["href"]})
-            
-        return {"districts": districts}
-
-    elif scraper_request.step == 2:
-        href = scraper_request.payload.get("href")
-        if not href:
-            raise HTTPException(status_code=400, detail="href not provided for step 2")
-            
-        url = f"https://www.tennisrecord.com{href}"
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            raise HTTPException(status_code=400, detail=f"Could not fetch URL: {e}")
-
-        soup = BeautifulSoup(response.content, "lxml")
-        
-        areas = []
-        for a in soup.select('a[href*="areaname="]'):
-            areas.append({"text": a.text, "href": a["href"]})
-            
-        return {"areas": areas}
-
-    elif scraper_request.step == 3:
-        href = scraper_request.payload.get("href")
-        if not href:
-            raise HTTPException(status_code=400, detail="href not provided for step 3")
-            
-        url = f"https://www.tennisrecord.com{href}"
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            raise HTTPException(status_code=400, detail=f"Could not fetch URL: {e}")
-
-        soup = BeautifulSoup(response.content, "lxml")
-        genders = []
-        for a in soup.select('a[href*="leaguefind.aspx"]'):
-            genders.append({"text": a.text, "href": a["href"]})
-            
-        return {"genders": genders}
-
-    elif scraper_request.step == 4:
-        href = scraper_request.payload.get("href")
-        if not href:
-            raise HTTPException(status_code=400, detail="href not provided for step 4")
-            
-        url = f"https://www.tennisrecord.com{href}"
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            raise HTTPException(status_code=400, detail=f"Could not fetch URL: {e}")
-
-        soup = BeautifulSoup(response.content, "html.parser")
-        
-        flights = []
-        tables = soup.find_all('table', class_='responsive14')
-        if tables:
-            table = tables[-1]
-            for row in table.find_all('tr')[1:]: # Skip header row
-                cols = row.find_all('td')
-                if len(cols) == 4:
-                    league_name_link = cols[0].find('a')
-                    league_name = league_name_link.text
-                    href = league_name_link['href']
-                    flight = cols[1].text
-                    sub_flight = cols[2].text
-                    teams = cols[3].text
-                    flights.append({
-                        "league_name": league_name,
-                        "flight": flight,
-                        "sub_flight": sub_flight,
-                        "teams": teams,
-                        "href": href
-                    })
-            
-        return {"flights": flights}
-
-    elif scraper_request.step == 5:
-        href = scraper_request.payload.get("href")
-        if not href:
-            raise HTTPException(status_code=400, detail="href not provided for step 5")
-            
-        url = f"https://www.tennisrecord.com{href}"
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            raise HTTPException(status_code=400, detail=f"Could not fetch URL: {e}")
-
-        soup = BeautifulSoup(response.content, "html.parser")
-        
-        teams = []
-        table = soup.find('div', class_='container1000').find('table', class_='responsive14')
-        if table:
-            for row in table.find_all('tr')[1:]: # Skip header row
-                cols = row.find_all('td')
-                if len(cols) == 5:
-                    team_name_link = cols[0].find('a')
-                    team_name = team_name_link.text
-                    href = team_name_link['href']
-                    players = cols[1].text
-                    top_5_rating = cols[2].text
-                    team_rating = cols[3].text
-                    court_rating = cols[4].text
-                    teams.append({
-                        "team_name": team_name,
-                        "players": players,
-                        "top_5_rating": top_5_rating,
-                        "team_rating": team_rating,
-                        "court_rating": court_rating,
-                        "href": href
-                    })
-            
-        return {"teams": teams}
-
-    elif scraper_request.step == 6:
-        href = scraper_request.payload.get("href")
-        gender = scraper_request.payload.get("gender")
-        team_name = scraper_request.payload.get("team_name")
-
-        if not href:
-            raise HTTPException(status_code=400, detail="href not provided for step 6")
-        if not gender:
-            raise HTTPException(status_code=400, detail="gender not provided for step 6")
-        if not team_name:
-            raise HTTPException(status_code=400, detail="team_name not provided for step 6")
-            
-        url = f"https://www.tennisrecord.com{href}"
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            raise HTTPException(status_code=400, detail=f"Could not fetch URL: {e}")
-
-        soup = BeautifulSoup(response.content, "html.parser")
-        
-        # Get or create team
-        db_team = crud.get_team_by_name(db, name=team_name)
-        if not db_team:
-            db_team = crud.create_team(db, team=schemas.TeamCreate(name=team_name))
-
-        players = []
-        table = soup.find('div', class_='large').find('table', class_='responsive14')
-        for row in table.find_all('tr')[1:]: # Skip header row
-            cols = row.find_all('td')
-            if len(cols) >= 11:
-                player_name_link = cols[0].find('a')
-                player_name = player_name_link.text
-                player_href = player_name_link['href']
-                location = cols[1].text
-                ntrp = cols[2].text
-                rating = cols[10].text
-                
-                player_data = schemas.PlayerCreate(
-                    name=player_name,
-                    href=player_href,
-                    location=location,
-                    ntrp=ntrp,
-                    rating=rating,
-                    gender=gender
-                )
-
-                db_player = crud.get_player_by_href(db, href=player_href)
-                if db_player:
-                    db_player = crud.update_player(db, db_player=db_player, player_update=player_data)
-                else:
-                    db_player = crud.create_player(db, player=player_data)
-                
-                if db_player not in db_team.players:
-                    crud.add_player_to_team(db, db_team=db_team, db_player=db_player)
-
-                players.append(schemas.PlayerResponse.model_validate(db_player))
-            
-        return {"players": players}
-
-    else:
-        raise HTTPException(status_code=400, detail="Invalid step")
\ No newline at end of file
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics():
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+@router.post("/scraper", tags=["Scraper"])
+def scrape_url(
+    scraper_request: schemas.ScraperRequest,
+    stream: str | None = Query(None, pattern="^(ndjson|sse)$"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_admin_user),
+):
+    # Imported on first use: the scraper pulls in requests and lxml
+    from app import scraper
+
+    try:
+        if stream is not None:
+            records = scraper.stream_step(scraper_request.step, scraper_request.payload)
+            return StreamingResponse(
+                (scraper.encode_event(stream, event, data) for event, data in records),
+                media_type=STREAM_MEDIA_TYPES[stream],
+            )
+        return scraper.run_step(db, scraper_request.step, scraper_request.payload)
+    except scraper.ScraperError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/scraper/cache", tags=["Scraper"])
+def read_scraper_cache_stats(current_user: models.User = Depends(get_current_admin_user)):
+    from app.cache import page_cache
+
+    return page_cache.stats()
+
+
+@router.post("/scraper/jobs", response_model=schemas.ScraperJob, status_code=status.HTTP_202_ACCEPTED, tags=["Scraper"])
+def enqueue_scraper_job(scraper_request: schemas.ScraperRequest, current_user: models.User = Depends(get_current_admin_user)):
+    # Imported on first use, like the scraper: Celery is not needed to serve the API
+    from app import tasks
+
+    job = tasks.run_scraper_step.delay(scraper_request.step, scraper_request.payload, enqueued_at=time.time())
+    return {"job_id": job.id, "status": job.status, "step": scraper_request.step}
+
+
+@router.get("/scraper/jobs/{job_id}", response_model=schemas.ScraperJob, tags=["Scraper"])
+def read_scraper_job(job_id: str, current_user: models.User = Depends(get_current_admin_user)):
+    from app.celery_app import celery
+    from celery.result import AsyncResult
+
+    job = AsyncResult(job_id, app=celery)
+    state = {"job_id": job_id, "status": job.status}
+    if job.failed():
+        state["error"] = str(job.result)
+    elif isinstance(job.info, dict):
+        state.update(job.info)
+    return state
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.include_router(router)
+    return app
+
+
+app = create_app()
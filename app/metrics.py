@@ -0,0 +1,295 @@
+"""Minimal Prometheus-style metrics for the API, DB pools, scraper and Celery.
+
+Metric objects and their bucket arrays are allocated up front (or once per new
+label set), so recording a sample is a bisect plus two list increments.
+Writers from worker threads serialize on a per-metric lock; rendering never
+takes a lock and reads whatever the counters hold at that moment.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+
+import redis
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+TASK_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount: float = 1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labelvalues, value in list(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose samples are read from ``collect()`` at render time."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple, collect):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.collect = collect
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        try:
+            samples = self.collect()
+        except Exception as e:
+            logger.warning("Could not collect %s: %s", self.name, e)
+            samples = []
+        for labelvalues, value in samples:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # label values -> [per-bucket counts (last slot is +Inf), sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _series_for(self, labelvalues: tuple) -> list:
+        series = self._series.get(labelvalues)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(labelvalues, [[0] * (len(self.buckets) + 1), 0.0])
+        return series
+
+    def observe(self, value: float, *labelvalues):
+        series = self._series_for(labelvalues)
+        with self._lock:
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labelvalues, (counts, total) in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), list(counts)):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labelvalues, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labelvalues)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labelvalues)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", ("method", "route"),
+))
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route and status code.", ("method", "route", "status"),
+))
+db_pool_checkouts = registry.register(Counter(
+    "db_pool_checkouts_total", "Connections checked out of the SQLAlchemy pool.", ("engine",),
+))
+db_pool_wait = registry.register(Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection.", ("engine",),
+))
+scraper_fetch_duration = registry.register(Histogram(
+    "scraper_fetch_duration_seconds", "Upstream fetch latency by scraper step.", ("step",),
+))
+scraper_fetch_errors = registry.register(Counter(
+    "scraper_fetch_errors_total", "Failed upstream fetches by scraper step.", ("step",),
+))
+scraper_coalesced_fetches = registry.register(Counter(
+    "scraper_coalesced_fetches_total", "Fetches served by another worker's in-flight request, by host.", ("host",),
+))
+scraper_rate_limit_wait = registry.register(Histogram(
+    "scraper_rate_limit_wait_seconds", "Time spent waiting for an upstream request token, by host.", ("host",),
+))
+
+
+class MetricsMiddleware:
+    """ASGI middleware that records latency and status per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            http_request_duration.observe(time.perf_counter() - start, scope["method"], path)
+            http_requests.inc(scope["method"], path, status_code)
+
+
+def register_pool_gauges(engines: dict):
+    """Expose size, checked-out and overflow gauges for ``{label: engine}``."""
+    registry.register(Gauge(
+        "db_pool_size", "Configured SQLAlchemy pool size.", ("engine",),
+        lambda: [((name,), engine.pool.size()) for name, engine in engines.items()],
+    ))
+    registry.register(Gauge(
+        "db_pool_checked_out", "Connections currently checked out.", ("engine",),
+        lambda: [((name,), engine.pool.checkedout()) for name, engine in engines.items()],
+    ))
+    registry.register(Gauge(
+        "db_pool_overflow", "Connections open beyond the pool size.", ("engine",),
+        lambda: [((name,), max(engine.pool.overflow(), 0)) for name, engine in engines.items()],
+    ))
+
+
+def timed_pool(pool_class, engine_label: str):
+    """Subclass ``pool_class`` so every checkout records its wait time."""
+
+    class TimedPool(pool_class):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                db_pool_wait.observe(time.perf_counter() - start, engine_label)
+                db_pool_checkouts.inc(engine_label)
+
+    TimedPool.__name__ = f"Timed{pool_class.__name__}"
+    return TimedPool
+
+
+# Celery workers run in other processes, so their task runtimes are
+# accumulated in Redis and read back when /metrics is rendered.
+TASK_RUNTIME_KEY = "metrics:celery:task_runtime:"
+
+_redis = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5) if settings.REDIS_URL else None
+
+
+def record_task_runtime(task_name: str, seconds: float, state: str):
+    if _redis is None:
+        return
+    bucket = bisect_left(TASK_BUCKETS, seconds)
+    try:
+        pipe = _redis.pipeline(transaction=False)
+        pipe.hincrby(TASK_RUNTIME_KEY + task_name, f"bucket:{bucket}", 1)
+        pipe.hincrbyfloat(TASK_RUNTIME_KEY + task_name, "sum", seconds)
+        pipe.hincrby(TASK_RUNTIME_KEY + task_name, f"state:{state}", 1)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning("Could not record runtime for %s: %s", task_name, e)
+
+
+class CeleryMetrics:
+    """Renders queue depth from the broker and task runtimes recorded by workers.
+
+    Without ``celery_app``, ``app.celery_app`` is imported on the first render
+    rather than when the API starts.
+    """
+
+    def __init__(self, celery_app=None, queues: tuple = ("celery",)):
+        self._celery_app = celery_app
+        self.queues = queues
+
+    @property
+    def celery_app(self):
+        if self._celery_app is None:
+            from .celery_app import celery
+
+            self._celery_app = celery
+        return self._celery_app
+
+    def render(self) -> list[str]:
+        lines = []
+        try:
+            lines.extend(self._render_queue_depth())
+            lines.extend(self._render_task_runtimes())
+        except redis.RedisError as e:
+            logger.warning("Could not collect Celery metrics: %s", e)
+        return lines
+
+    def _render_queue_depth(self) -> list[str]:
+        broker_url = self.celery_app.conf.broker_url or ""
+        if not broker_url.startswith("redis"):
+            return []
+        broker = redis.Redis.from_url(broker_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        pipe = broker.pipeline(transaction=False)
+        for queue in self.queues:
+            pipe.llen(queue)
+        depths = pipe.execute()
+        lines = ["# HELP celery_queue_depth Messages waiting in the broker queue.", "# TYPE celery_queue_depth gauge"]
+        lines.extend(f'celery_queue_depth{{queue="{queue}"}} {depth}' for queue, depth in zip(self.queues, depths))
+        return lines
+
+    def _render_task_runtimes(self) -> list[str]:
+        if _redis is None:
+            return []
+        name = "celery_task_runtime_seconds"
+        lines = [f"# HELP {name} Celery task runtime by task.", f"# TYPE {name} histogram"]
+        states = ["# HELP celery_tasks_total Finished Celery tasks by state.", "# TYPE celery_tasks_total counter"]
+        for key in _redis.scan_iter(match=TASK_RUNTIME_KEY + "*"):
+            task = key.decode()[len(TASK_RUNTIME_KEY):]
+            fields = {field.decode(): value.decode() for field, value in _redis.hgetall(key).items()}
+            cumulative = 0
+            for index, bound in enumerate(TASK_BUCKETS + ("+Inf",)):
+                cumulative += int(fields.get(f"bucket:{index}", 0))
+                lines.append(f'{name}_bucket{{task="{task}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{task="{task}"}} {float(fields.get("sum", 0))}')
+            lines.append(f'{name}_count{{task="{task}"}} {cumulative}')
+            states.extend(
+                f'celery_tasks_total{{task="{task}",state="{field[len("state:"):]}"}} {value}'
+                for field, value in fields.items() if field.startswith("state:")
+            )
+        return lines + states
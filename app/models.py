@@ -1,11 +1,13 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table
+from sqlalchemy import Column, Integer, Numeric, String, ForeignKey, Index, Table
 from sqlalchemy.orm import relationship
 from .database import TimestampedBase
 
 # Association table for the many-to-many relationship between players and teams
 player_team_association = Table('player_team_association', TimestampedBase.metadata,
-    Column('player_id', Integer, ForeignKey('players.id')),
-    Column('team_id', Integer, ForeignKey('teams.id'))
+    Column('player_id', Integer, ForeignKey('players.id'), primary_key=True),
+    Column('team_id', Integer, ForeignKey('teams.id'), primary_key=True),
+    # The (player_id, team_id) primary key serves a player's teams; rosters need the reverse
+    Index('ix_player_team_association_team_id_player_id', 'team_id', 'player_id'),
 )
 
 class User(TimestampedBase):
@@ -22,11 +24,20 @@ class Team(TimestampedBase):
     __tablename__ = "teams"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, index=True)
+    name = Column(String, unique=True, index=True)
+    # Roster page and gender the team was imported from, used to re-sync it
+    href = Column(String, index=True)
+    gender = Column(String)
     players = relationship("Player",
                     secondary=player_team_association,
                     back_populates="teams")
 
+    # Keyset pagination orders by id within each filter
+    __table_args__ = (
+        Index('ix_teams_name_id', 'name', 'id'),
+        Index('ix_teams_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
+
 class Player(TimestampedBase):
     __tablename__ = "players"
 
@@ -37,6 +48,25 @@ class Player(TimestampedBase):
     ntrp = Column(String)
     rating = Column(String)
     gender = Column(String)
+    # Numeric forms of ntrp ("3.5C" -> 3.5) and rating for range queries
+    ntrp_value = Column(Numeric(2, 1, asdecimal=False))
+    rating_value = Column(Numeric(5, 4, asdecimal=False))
+    # md5 over name, location, ntrp and rating; see crud.player_content_hash
+    content_hash = Column(String(32))
     teams = relationship("Team",
                    secondary=player_team_association,
                    back_populates="players")
+
+    # Keyset pagination orders by id within each filter
+    __table_args__ = (
+        Index('ix_players_gender_ntrp_id', 'gender', 'ntrp', 'id'),
+        Index('ix_players_ntrp_id', 'ntrp', 'id'),
+        Index('ix_players_location_id', 'location', 'id'),
+        Index('ix_players_gender_id', 'gender', 'id'),
+        Index('ix_players_gender_location_id', 'gender', 'location', 'id'),
+        Index('ix_players_location_ntrp_id', 'location', 'ntrp', 'id'),
+        Index('ix_players_gender_ntrp_location_id', 'gender', 'ntrp', 'location', 'id'),
+        Index('ix_players_gender_ntrp_value_rating_value', 'gender', 'ntrp_value', 'rating_value'),
+        # Fuzzy name search (pg_trgm)
+        Index('ix_players_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
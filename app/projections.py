@@ -0,0 +1,21 @@
+"""Column projections for the list responses.
+
+List endpoints and the step-6 import select only the columns their response
+schema exposes and turn each row straight into a dict. This skips ORM
+hydration and per-object Pydantic validation, and the result goes out through
+orjson.
+"""
+from . import models, schemas
+
+
+def _columns(model, schema) -> tuple:
+    return tuple(model.__table__.c[name] for name in schema.model_fields)
+
+
+USER_COLUMNS = _columns(models.User, schemas.User)
+PLAYER_COLUMNS = _columns(models.Player, schemas.PlayerResponse)
+TEAM_COLUMNS = _columns(models.Team, schemas.TeamResponse)
+
+
+def as_dicts(rows) -> list[dict]:
+    return [row._asdict() for row in rows]
@@ -24,6 +24,10 @@ class User(UserBase):
     class Config:
         from_attributes = True
 
+class UserPage(BaseModel):
+    items: list[User]
+    next_cursor: int | None = None
+
 class Token(BaseModel):
     access_token: str
     refresh_token: str
@@ -50,6 +54,8 @@ class PlayerBase(BaseModel):
     ntrp: str
     rating: str
     gender: str
+    ntrp_value: float | None = None
+    rating_value: float | None = None
 
 class PlayerCreate(PlayerBase):
     pass
@@ -60,24 +66,61 @@ class PlayerResponse(PlayerBase):
     class Config:
         from_attributes = True
 
-class Player(PlayerBase):
-    id: int
-    teams: list['Team'] = [] # Forward reference
-
-    class Config:
-        from_attributes = True
-
 class TeamBase(BaseModel):
     name: str
+    href: str | None = None
+    gender: str | None = None
 
 class TeamCreate(TeamBase):
     pass
 
-class Team(TeamBase):
+class TeamResponse(TeamBase):
     id: int
-    players: list[Player] = []
 
     class Config:
         from_attributes = True
 
-Player.model_rebuild()
+# Nesting stops one level down: a player's teams carry no players and a
+# team's players carry no teams, so serializing never walks the whole graph
+class Player(PlayerResponse):
+    teams: list[TeamResponse] = []
+
+class Team(TeamResponse):
+    players: list[PlayerResponse] = []
+
+class PlayerMatch(PlayerResponse):
+    score: float
+
+class TeamMatch(TeamResponse):
+    score: float
+
+class IngestResult(BaseModel):
+    received: int
+    inserted: int
+    updated: int
+    unchanged: int
+    duplicates: int
+    rejected: int
+    teams_inserted: int
+    links_inserted: int
+
+class PlayerPage(BaseModel):
+    items: list[PlayerResponse]
+    next_cursor: int | None = None
+
+class TeamPage(BaseModel):
+    items: list[TeamResponse]
+    next_cursor: int | None = None
+
+class ScraperJob(BaseModel):
+    job_id: str
+    status: str
+    step: int | None = None
+    stage: str | None = None
+    partial: dict | None = None
+    result: dict | None = None
+    error: str | None = None
+    enqueued_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    elapsed: float | None = None
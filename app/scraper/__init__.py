@@ -0,0 +1,233 @@
+"""The league import wizard: fetching, parsing and importing tennisrecord.com pages.
+
+This package pulls in requests and lxml, so the API and the Celery worker
+import it on first use rather than at startup.
+"""
+import time
+
+import orjson
+import requests
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import crud, metrics, projections, schemas
+from ..cache import page_cache
+from ..config import settings
+from ..database import SessionLocal
+from . import http_client, parsers
+
+DISTRICTS_PATH = "/adult/league/leaguedistrict.aspx"
+
+
+class ScraperError(Exception):
+    """Raised when a scraper step cannot be completed from the given payload."""
+
+
+def fetch_page(url: str, params: dict | None = None, step: int | None = None) -> bytes:
+    label = str(step) if step is not None else "other"
+    start = time.perf_counter()
+    try:
+        return http_client.fetch(url, params=params).content
+    except requests.exceptions.RequestException as e:
+        metrics.scraper_fetch_errors.inc(label)
+        raise ScraperError(f"Could not fetch URL: {e}")
+    finally:
+        metrics.scraper_fetch_duration.observe(time.perf_counter() - start, label)
+
+
+def page_url(href: str, base_url: str | None = None) -> str:
+    return f"{base_url or settings.SCRAPER_BASE_URL}{href}"
+
+
+def parse_roster(content: bytes, gender: str) -> list[schemas.PlayerCreate]:
+    return [schemas.PlayerCreate(**player, gender=gender) for player in parsers.parse_roster(content)]
+
+
+def roster_team(db: Session, team_name: str, href: str | None = None, gender: str | None = None):
+    db_team = crud.get_team_by_name(db, name=team_name)
+    if not db_team:
+        try:
+            return crud.create_team(db, team=schemas.TeamCreate(name=team_name, href=href, gender=gender))
+        except IntegrityError:
+            # Created meanwhile by another import; team names are unique
+            db.rollback()
+            db_team = crud.get_team_by_name(db, name=team_name)
+    if href and (db_team.href, db_team.gender) != (href, gender):
+        # Remember where the roster came from so it can be re-synced
+        db_team = crud.update_team(db, db_team, {"href": href, "gender": gender})
+    return db_team
+
+
+def import_roster(db: Session, team_name: str, roster: list[schemas.PlayerCreate], href: str | None = None, gender: str | None = None) -> list[dict]:
+    db_team = roster_team(db, team_name, href=href, gender=gender)
+    db_players = crud.bulk_upsert_players(db, db_team=db_team, players=roster)
+    return projections.as_dicts(db_players)
+
+
+def _report(progress, stage: str, partial: dict | None = None):
+    if progress is not None:
+        progress(stage, partial)
+
+
+def fetch_parsed(step: int, url: str, parse, params: dict | None = None, progress=None):
+    """Fetch and parse a wizard page, serving it from the page cache when the step has a TTL."""
+    ttl = settings.SCRAPER_CACHE_TTLS.get(step)
+    if ttl:
+        key = page_cache.key(url, params)
+        cached = page_cache.get(step, key)
+        if cached is not None:
+            _report(progress, "cached")
+            return cached
+
+    _report(progress, "fetching")
+    content = fetch_page(url, params=params, step=step)
+    _report(progress, "parsing")
+    result = parse(content)
+    if ttl:
+        page_cache.set(key, result, ttl)
+    return result
+
+
+def run_step(db: Session, step: int, payload: dict | None, progress=None) -> dict:
+    """Run one step of the league import wizard and return its JSON payload.
+
+    ``progress`` is an optional ``callback(stage, partial)`` invoked as the step
+    moves through fetching, parsing and persisting, so background jobs can
+    report partial results.
+    """
+    payload = payload or {}
+
+    if step == 1:
+        year = payload.get("year")
+        lt = payload.get("lt")
+        sectionname = payload.get("sectionname")
+
+        if not all([year, lt, sectionname]):
+            raise ScraperError("Missing required parameters for step 1")
+
+        params = {
+            "year": year,
+            "lt": lt,
+            "sectionname": sectionname
+        }
+        return {"districts": fetch_parsed(1, page_url(DISTRICTS_PATH), parsers.parse_districts, params=params, progress=progress)}
+
+    if step in (2, 3, 4, 5):
+        href = payload.get("href")
+        if not href:
+            raise ScraperError(f"href not provided for step {step}")
+
+        step_parsers = {
+            2: ("areas", parsers.parse_areas),
+            3: ("genders", parsers.parse_genders),
+            4: ("flights", parsers.parse_flights),
+            5: ("teams", parsers.parse_teams),
+        }
+        key, parse = step_parsers[step]
+        return {key: fetch_parsed(step, page_url(href), parse, progress=progress)}
+
+    if step == 6:
+        href, gender, team_name = _roster_payload(payload)
+        _report(progress, "fetching")
+        content = fetch_page(page_url(href), step=6)
+        _report(progress, "parsing")
+        roster = parse_roster(content, gender=gender)
+        _report(progress, "importing", {"parsed": len(roster)})
+        return {"players": import_roster(db, team_name=team_name, roster=roster, href=href, gender=gender)}
+
+    raise ScraperError("Invalid step")
+
+
+def _roster_payload(payload: dict) -> tuple[str, str, str]:
+    href = payload.get("href")
+    gender = payload.get("gender")
+    team_name = payload.get("team_name")
+
+    if not href:
+        raise ScraperError("href not provided for step 6")
+    if not gender:
+        raise ScraperError("gender not provided for step 6")
+    if not team_name:
+        raise ScraperError("team_name not provided for step 6")
+    return href, gender, team_name
+
+
+def stream_step(step: int, payload: dict | None):
+    """Fetch and parse a step 5 or 6 page, then return a generator of ``(event, data)`` records.
+
+    Payload and upstream errors raise ``ScraperError`` here, before any
+    response has been started. Step 5 yields a ``team`` record per listed
+    team and step 6 a ``player`` record per player as soon as the batch
+    holding it is committed; both end with a ``summary`` record of counts
+    and timings.
+    """
+    payload = payload or {}
+    start = time.perf_counter()
+    if step == 5:
+        href = payload.get("href")
+        if not href:
+            raise ScraperError("href not provided for step 5")
+        teams = fetch_parsed(5, page_url(href), parsers.parse_teams)
+        timings = {"fetch": time.perf_counter() - start}
+        return _stream_events(start, _stream_teams(teams, timings))
+    if step == 6:
+        href, gender, team_name = _roster_payload(payload)
+        content = fetch_page(page_url(href), step=6)
+        fetched = time.perf_counter()
+        # Keep the last row per href, as upsert_roster does, so no player is sent twice
+        roster = list({player.href: player for player in parse_roster(content, gender=gender)}.values())
+        timings = {"fetch": fetched - start, "parse": time.perf_counter() - fetched}
+        return _stream_events(start, _stream_roster(href, gender, team_name, roster, timings))
+    raise ScraperError("Streaming is only supported for steps 5 and 6")
+
+
+def _stream_events(start: float, records):
+    first_row = None
+    for event, data in records:
+        if event == "summary":
+            data["timings"]["total"] = time.perf_counter() - start
+            data["timings"]["first_row"] = first_row
+        elif first_row is None:
+            first_row = time.perf_counter() - start
+        yield event, data
+
+
+def _stream_teams(teams: list[dict], timings: dict):
+    for team in teams:
+        yield "team", team
+    yield "summary", {"step": 5, "teams": len(teams), "timings": timings}
+
+
+def _stream_roster(href: str, gender: str, team_name: str, roster: list[schemas.PlayerCreate], timings: dict):
+    start = time.perf_counter()
+    written = 0
+    size = settings.SCRAPER_STREAM_BATCH_SIZE
+    with SessionLocal() as db:
+        db_team = roster_team(db, team_name, href=href, gender=gender)
+        team_id = db_team.id
+        for offset in range(0, len(roster), size):
+            db_players, batch_written = crud.upsert_roster(db, db_team=db_team, players=roster[offset:offset + size])
+            written += batch_written
+            for player in projections.as_dicts(db_players):
+                yield "player", player
+    yield "summary", {
+        "step": 6,
+        "team_id": team_id,
+        "parsed": len(roster),
+        "written": written,
+        "unchanged": len(roster) - written,
+        "timings": {**timings, "persist": time.perf_counter() - start},
+    }
+
+
+def encode_event(fmt: str, event: str, data: dict) -> bytes:
+    if fmt == "sse":
+        return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+    return orjson.dumps({"event": event, "data": data}) + b"\n"
+
+
+def resync_team(db: Session, db_team) -> dict:
+    """Re-fetch an imported team's roster and write only the players that changed."""
+    roster = parse_roster(fetch_page(page_url(db_team.href), step=6), gender=db_team.gender)
+    db_players, written = crud.upsert_roster(db, db_team=db_team, players=roster)
+    return {"team_id": db_team.id, "players": len(db_players), "written": written}
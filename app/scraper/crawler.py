@@ -0,0 +1,153 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from .. import scraper
+from ..config import settings
+from ..database import SessionLocal
+from . import parsers
+from .upstream import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CrawlStats:
+    pages: int = 0
+    districts: int = 0
+    areas: int = 0
+    genders: int = 0
+    flights: int = 0
+    teams: int = 0
+    players: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+class LeagueCrawler:
+    """Walks district -> area -> gender -> flight -> team -> roster for a section.
+
+    Every page is fetched on a bounded thread pool, throttled by the per-host
+    token bucket every fetch shares with the API and workers, and parsed with the wizard's step parsers. Each roster is imported
+    in its own session as soon as it has been parsed, so rows land in the
+    database while the rest of the tree is still being crawled.
+    """
+
+    def __init__(self, base_url: str | None = None, concurrency: int = 4, rate: float | None = None, session_factory=SessionLocal):
+        self.base_url = base_url or settings.SCRAPER_BASE_URL
+        self.session_factory = session_factory
+        self.stats = CrawlStats()
+        if rate is not None:
+            # Sets the refill rate this process uses for the shared bucket
+            rate_limiter.rate = rate
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="crawler")
+        self._seen = set()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+
+    def crawl(self, year: str, lt: str, sectionname: str) -> CrawlStats:
+        params = {"year": year, "lt": lt, "sectionname": sectionname}
+        try:
+            self._submit(self._crawl_districts, params)
+            with self._idle:
+                while self._pending:
+                    self._idle.wait()
+        finally:
+            self._executor.shutdown(wait=True)
+        return self.stats
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            self._pending += 1
+        self._executor.submit(self._run, fn, *args)
+
+    def _run(self, fn, *args):
+        try:
+            fn(*args)
+        except Exception as e:
+            logger.warning("Crawl task %s%r failed: %s", fn.__name__, args, e)
+            with self._lock:
+                self.stats.errors.append(f"{fn.__name__}{args!r}: {e}")
+        finally:
+            with self._idle:
+                self._pending -= 1
+                if not self._pending:
+                    self._idle.notify_all()
+
+    def _fetch(self, href: str, step: int, params: dict | None = None) -> bytes | None:
+        url = scraper.page_url(href, base_url=self.base_url)
+        with self._lock:
+            key = (url, tuple(sorted((params or {}).items())))
+            if key in self._seen:
+                return None
+            self._seen.add(key)
+        content = scraper.fetch_page(url, params=params, step=step)
+        self._count("pages", 1)
+        return content
+
+    def _count(self, name: str, amount: int):
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + amount)
+
+    def _crawl_districts(self, params: dict):
+        content = self._fetch(scraper.DISTRICTS_PATH, 1, params=params)
+        if content is None:
+            return
+        districts = parsers.parse_districts(content)
+        self._count("districts", len(districts))
+        for district in districts:
+            self._submit(self._crawl_areas, district["href"])
+
+    def _crawl_areas(self, href: str):
+        content = self._fetch(href, 2)
+        if content is None:
+            return
+        areas = parsers.parse_areas(content)
+        self._count("areas", len(areas))
+        for area in areas:
+            self._submit(self._crawl_genders, area["href"])
+
+    def _crawl_genders(self, href: str):
+        content = self._fetch(href, 3)
+        if content is None:
+            return
+        genders = parsers.parse_genders(content)
+        self._count("genders", len(genders))
+        for gender in genders:
+            self._submit(self._crawl_flights, gender["href"], gender["text"].strip())
+
+    def _crawl_flights(self, href: str, gender: str):
+        content = self._fetch(href, 4)
+        if content is None:
+            return
+        flights = parsers.parse_flights(content)
+        self._count("flights", len(flights))
+        for flight in flights:
+            self._submit(self._crawl_teams, flight["href"], gender)
+
+    def _crawl_teams(self, href: str, gender: str):
+        content = self._fetch(href, 5)
+        if content is None:
+            return
+        teams = parsers.parse_teams(content)
+        self._count("teams", len(teams))
+        for team in teams:
+            self._submit(self._import_roster, team["href"], gender, team["team_name"])
+
+    def _import_roster(self, href: str, gender: str, team_name: str):
+        content = self._fetch(href, 6)
+        if content is None:
+            return
+        roster = scraper.parse_roster(content, gender=gender)
+        db = self.session_factory()
+        try:
+            players = scraper.import_roster(db, team_name=team_name, roster=roster, href=href, gender=gender)
+        finally:
+            db.close()
+        self._count("players", len(players))
+        logger.info("Imported %d players for %s", len(players), team_name)
+
+
+def crawl_section(year: str, lt: str, sectionname: str, base_url: str | None = None, concurrency: int = 4, rate: float | None = None) -> CrawlStats:
+    return LeagueCrawler(base_url=base_url, concurrency=concurrency, rate=rate).crawl(year, lt, sectionname)
@@ -0,0 +1,135 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+from .. import metrics
+from ..cache import normalize_url
+from ..config import settings
+from .upstream import rate_limiter, single_flight
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class RetryableStatusError(requests.exceptions.HTTPError):
+    """An upstream status that is worth retrying (throttling or a server error)."""
+
+
+@dataclass
+class Page:
+    url: str
+    content: bytes
+    not_modified: bool = False
+
+
+class _Validators:
+    """Bounded LRU of ETag/Last-Modified validators and the body they validate."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def put(self, url: str, etag: str | None, last_modified: str | None, content: bytes):
+        if not (etag or last_modified) or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[url] = (etag, last_modified, content)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+_validators = _Validators(settings.SCRAPER_REVALIDATE_CACHE_SIZE)
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide keep-alive session, recreating it after a fork."""
+    global _session, _session_pid
+    if _session is None or _session_pid != os.getpid():
+        with _session_lock:
+            if _session is None or _session_pid != os.getpid():
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=settings.SCRAPER_POOL_CONNECTIONS,
+                    pool_maxsize=settings.SCRAPER_POOL_MAXSIZE,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session, _session_pid = session, os.getpid()
+    return _session
+
+
+@retry(
+    retry=retry_if_exception_type((requests.exceptions.ConnectionError, requests.exceptions.Timeout, RetryableStatusError)),
+    stop=stop_after_attempt(settings.SCRAPER_MAX_ATTEMPTS),
+    wait=wait_exponential(multiplier=settings.SCRAPER_BACKOFF_SECONDS, max=settings.SCRAPER_BACKOFF_MAX_SECONDS),
+    reraise=True,
+)
+def _get(url: str, headers: dict) -> requests.Response:
+    host = urlsplit(url).netloc.lower()
+    metrics.scraper_rate_limit_wait.observe(rate_limiter.acquire(host), host)
+    response = get_session().get(
+        url,
+        headers=headers,
+        timeout=(settings.SCRAPER_CONNECT_TIMEOUT, settings.SCRAPER_READ_TIMEOUT),
+    )
+    if response.status_code in RETRYABLE_STATUS_CODES:
+        raise RetryableStatusError(f"{response.status_code} Server Error for url: {url}", response=response)
+    return response
+
+
+def fetch(url: str, params: dict | None = None) -> Page:
+    """GET ``url`` with pooled connections, timeouts, retries and revalidation.
+
+    Concurrent fetches of the same normalized URL, from any worker, share one
+    upstream request, and every request waits for its host's rate limiter.
+    Pages that came back with an ETag or Last-Modified header are revalidated
+    with If-None-Match/If-Modified-Since; a 304 returns the stored body with
+    ``not_modified`` set.
+    """
+    key = hashlib.sha1(normalize_url(url, params).encode()).hexdigest()
+    url = requests.Request("GET", url, params=params).prepare().url
+    pages = []
+    content, shared = single_flight.do(key, lambda: _fetch(url, pages))
+    if shared:
+        metrics.scraper_coalesced_fetches.inc(urlsplit(url).netloc.lower())
+        return Page(url=url, content=content)
+    return pages[0]
+
+
+def _fetch(url: str, pages: list) -> bytes:
+    headers = {}
+    cached = _validators.get(url)
+    if cached is not None:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    response = _get(url, headers)
+    if response.status_code == 304 and cached is not None:
+        pages.append(Page(url=url, content=cached[2], not_modified=True))
+        return cached[2]
+
+    response.raise_for_status()
+    _validators.put(url, response.headers.get("ETag"), response.headers.get("Last-Modified"), response.content)
+    pages.append(Page(url=url, content=response.content))
+    return response.content
@@ -0,0 +1,144 @@
+"""Targeted extractors for the tennisrecord.com pages used by the scraper.
+
+Only the target tags are reported by lxml's incremental HTML parser, elements
+are cleared once read, and parsing stops as soon as the wanted table is done.
+"""
+import re
+from decimal import ROUND_HALF_UP, Decimal
+from io import BytesIO
+
+from lxml import etree
+
+
+def _iter_tags(content: bytes, tag: str):
+    return etree.iterparse(BytesIO(content), events=("end",), tag=tag, html=True, recover=True, no_network=True)
+
+
+def _text(element) -> str:
+    return "".join(element.itertext())
+
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def parse_number(text: str) -> float | None:
+    """Leading number in a rating cell such as ``"3.5C"`` or ``"3.4012"``."""
+    match = _NUMBER.match(text.strip())
+    return float(match.group()) if match else None
+
+
+def parse_rating(text: str, places: int) -> float | None:
+    """``parse_number``, or None if the value does not fit ``numeric(places + 1, places)``.
+
+    Rounded half up to ``places`` as Postgres does, so a value such as
+    ``"9.96"`` that would round to 10 is dropped instead of aborting the
+    roster upsert. The ingest path rejects the same values.
+    """
+    match = _NUMBER.match(text.strip())
+    if not match:
+        return None
+    value = Decimal(match.group())
+    if value.quantize(Decimal(1).scaleb(-places), rounding=ROUND_HALF_UP) >= 10:
+        return None
+    return float(value)
+
+
+def _has_class(element, name: str) -> bool:
+    return name in (element.get("class") or "").split()
+
+
+def _has_ancestor(element, tag: str, class_name: str) -> bool:
+    return any(ancestor.tag == tag and _has_class(ancestor, class_name) for ancestor in element.iterancestors())
+
+
+def _links(content: bytes, href_contains: str) -> list[dict]:
+    links = []
+    for _, a in _iter_tags(content, "a"):
+        href = a.get("href")
+        if href is not None and href_contains in href:
+            links.append({"text": _text(a), "href": href})
+        a.clear(keep_tail=True)
+    return links
+
+
+def _rows(table) -> list[list]:
+    # The first row is the header
+    return [list(row.iter("td")) for row in list(table.iter("tr"))[1:]]
+
+
+def _first_table(content: bytes, container_class: str):
+    """First ``table.responsive14`` inside a ``div.<container_class>``, or None."""
+    for _, table in _iter_tags(content, "table"):
+        if _has_class(table, "responsive14") and _has_ancestor(table, "div", container_class):
+            return table
+        table.clear(keep_tail=True)
+    return None
+
+
+def parse_districts(content: bytes) -> list[dict]:
+    return _links(content, "leaguearea.aspx")
+
+
+def parse_areas(content: bytes) -> list[dict]:
+    return _links(content, "areaname=")
+
+
+def parse_genders(content: bytes) -> list[dict]:
+    return _links(content, "leaguefind.aspx")
+
+
+def parse_flights(content: bytes) -> list[dict]:
+    # The flight listing is the last responsive14 table on the page
+    flights = []
+    for _, table in _iter_tags(content, "table"):
+        if _has_class(table, "responsive14"):
+            flights = []
+            for cols in _rows(table):
+                if len(cols) == 4:
+                    league_name_link = cols[0].find(".//a")
+                    flights.append({
+                        "league_name": _text(league_name_link),
+                        "flight": _text(cols[1]),
+                        "sub_flight": _text(cols[2]),
+                        "teams": _text(cols[3]),
+                        "href": league_name_link.get("href")
+                    })
+        table.clear(keep_tail=True)
+    return flights
+
+
+def parse_teams(content: bytes) -> list[dict]:
+    teams = []
+    table = _first_table(content, "container1000")
+    if table is not None:
+        for cols in _rows(table):
+            if len(cols) == 5:
+                team_name_link = cols[0].find(".//a")
+                teams.append({
+                    "team_name": _text(team_name_link),
+                    "players": _text(cols[1]),
+                    "top_5_rating": _text(cols[2]),
+                    "team_rating": _text(cols[3]),
+                    "court_rating": _text(cols[4]),
+                    "href": team_name_link.get("href")
+                })
+    return teams
+
+
+def parse_roster(content: bytes) -> list[dict]:
+    players = []
+    table = _first_table(content, "large")
+    if table is not None:
+        for cols in _rows(table):
+            if len(cols) >= 11:
+                player_name_link = cols[0].find(".//a")
+                players.append({
+                    "name": _text(player_name_link),
+                    "href": player_name_link.get("href"),
+                    "location": _text(cols[1]),
+                    "ntrp": _text(cols[2]),
+                    "rating": _text(cols[10]),
+                    "ntrp_value": parse_rating(_text(cols[2]), 1),
+                    "rating_value": parse_rating(_text(cols[10]), 4),
+                })
+    return players
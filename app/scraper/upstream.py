@@ -0,0 +1,236 @@
+"""Cross-worker coordination of upstream fetches.
+
+``SingleFlight`` coalesces concurrent fetches of the same normalized URL onto
+one request whose result fans out to every waiter, and ``RateLimiter`` is a
+token bucket per upstream host. Both keep their state in Redis so API and
+Celery workers share it, and fall back to in-process state while Redis is
+unreachable, like the page cache.
+"""
+import logging
+import threading
+import time
+import uuid
+
+import redis
+import requests
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Reserve one token and return how long the caller must wait for it. The
+# balance may go negative, so concurrent callers queue up behind each other.
+TAKE_TOKEN = """
+local rate, burst = tonumber(ARGV[1]), tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'at')
+local tokens = tonumber(state[1]) or burst
+local at = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - at) * rate) - 1
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((burst - tokens) / rate) + 1)
+if tokens >= 0 then return '0' end
+return tostring(-tokens / rate)
+"""
+
+# Delete the lock only if this worker still holds it
+RELEASE_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end
+return 0
+"""
+
+
+class CoalescedFetchError(requests.exceptions.RequestException):
+    """The in-flight fetch this request waited on failed."""
+
+
+class _RedisBacked:
+    retry_after = 30.0
+
+    def __init__(self, redis_url: str | None):
+        self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5) if redis_url else None
+        self._redis_down_until = 0.0
+
+    def _backend(self):
+        if self._redis is not None and time.monotonic() >= self._redis_down_until:
+            return self._redis
+        return None
+
+    def _redis_failed(self, e: Exception):
+        logger.warning("%s falling back to in-process state: %s", type(self).__name__, e)
+        self._redis_down_until = time.monotonic() + self.retry_after
+
+
+class _LocalBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.at = time.monotonic()
+
+    def take(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.at) * self.rate) - 1
+        self.at = now
+        return max(0.0, -self.tokens / self.rate)
+
+
+class RateLimiter(_RedisBacked):
+    """Token bucket per host: ``rate`` requests per second with bursts of ``burst``."""
+
+    prefix = "scraper:rate:"
+
+    def __init__(self, redis_url: str | None, rate: float, burst: int):
+        super().__init__(redis_url)
+        self.rate = rate
+        self.burst = burst
+        self.local = {}
+        self._lock = threading.Lock()
+        self._take = self._redis.register_script(TAKE_TOKEN) if self._redis is not None else None
+
+    def reserve(self, host: str) -> float:
+        """Take a token for ``host`` and return the seconds to wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        if self._backend() is not None:
+            try:
+                return float(self._take(keys=[self.prefix + host], args=[self.rate, self.burst]))
+            except redis.RedisError as e:
+                self._redis_failed(e)
+        with self._lock:
+            bucket = self.local.setdefault(host, _LocalBucket(self.rate, self.burst))
+            return bucket.take()
+
+    def acquire(self, host: str) -> float:
+        """Block until a request to ``host`` is allowed; returns the time waited."""
+        wait = self.reserve(host)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.content = None
+        self.error = None
+
+
+class SingleFlight(_RedisBacked):
+    """Runs at most one fetch per key at a time across all workers.
+
+    The first caller takes a lease in Redis and fetches; everyone else waits
+    on a pub/sub channel for that lease's result, which stays readable for
+    ``result_ttl`` seconds. If the leader dies, its lease runs out and the
+    next waiter takes over.
+    """
+
+    prefix = "scraper:flight:"
+
+    def __init__(self, redis_url: str | None, lease: float, result_ttl: int):
+        super().__init__(redis_url)
+        self.lease = lease
+        self.result_ttl = result_ttl
+        self.local = {}
+        self._lock = threading.Lock()
+        self._release = self._redis.register_script(RELEASE_LOCK) if self._redis is not None else None
+
+    def do(self, key: str, fetch) -> tuple[bytes, bool]:
+        """Return ``fetch()``'s content for ``key`` and whether another caller fetched it."""
+        backend = self._backend()
+        if backend is not None:
+            try:
+                return self._do_redis(backend, key, fetch)
+            except redis.RedisError as e:
+                self._redis_failed(e)
+        return self._do_local(key, fetch)
+
+    def _do_redis(self, backend, key: str, fetch) -> tuple[bytes, bool]:
+        lock_key, channel = self.prefix + key + ":lock", self.prefix + key
+        # Results are keyed by the leader's lease token, so a waiter only ever
+        # reads the outcome of the flight it joined, never an earlier one
+        result_prefix = self.prefix + key + ":result:"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lease
+        while True:
+            if backend.set(lock_key, token, nx=True, px=int(self.lease * 1000)):
+                return self._lead(backend, lock_key, result_prefix + token, channel, token, fetch), False
+            leader = backend.get(lock_key)
+            if leader is None:
+                # That flight ended between the two calls; try to lead the next one
+                continue
+            result = self._wait(backend, lock_key, result_prefix + leader.decode(), channel, leader, deadline)
+            if result is not None:
+                if b"error" in result:
+                    raise CoalescedFetchError(result[b"error"].decode())
+                return result[b"content"], True
+            if time.monotonic() >= deadline:
+                # The leader is stuck past its lease; fetch without coordination
+                return fetch(), False
+
+    def _lead(self, backend, lock_key: str, result_key: str, channel: str, token: str, fetch) -> bytes:
+        outcome = None
+        try:
+            content = fetch()
+            outcome = {"content": content}
+            return content
+        except requests.exceptions.RequestException as e:
+            outcome = {"error": str(e)}
+            raise
+        finally:
+            try:
+                pipe = backend.pipeline()
+                if outcome is not None:
+                    pipe.hset(result_key, mapping=outcome)
+                    pipe.expire(result_key, self.result_ttl)
+                    pipe.publish(channel, token)
+                pipe.execute()
+                self._release(keys=[lock_key], args=[token])
+            except redis.RedisError as e:
+                self._redis_failed(e)
+
+    def _wait(self, backend, lock_key: str, result_key: str, channel: str, leader: bytes, deadline: float):
+        pubsub = backend.pubsub(ignore_subscribe_messages=True)
+        try:
+            # Subscribe before looking, so a result published in between is not missed
+            pubsub.subscribe(channel)
+            while time.monotonic() < deadline:
+                result = backend.hgetall(result_key)
+                if result:
+                    return result
+                if backend.get(lock_key) != leader:
+                    # Finished (or died) between the two reads
+                    return backend.hgetall(result_key) or None
+                pubsub.get_message(timeout=min(0.25, max(0.0, deadline - time.monotonic())))
+            return None
+        finally:
+            pubsub.close()
+
+    def _do_local(self, key: str, fetch) -> tuple[bytes, bool]:
+        with self._lock:
+            flight = self.local.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.local[key] = _Flight()
+        if not leader:
+            flight.done.wait(self.lease)
+            if flight.error is not None:
+                raise CoalescedFetchError(str(flight.error))
+            if flight.content is not None:
+                return flight.content, True
+            return fetch(), False
+        try:
+            flight.content = fetch()
+            return flight.content, False
+        except requests.exceptions.RequestException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self.local[key]
+            flight.done.set()
+
+
+rate_limiter = RateLimiter(settings.REDIS_URL, settings.SCRAPER_RATE_PER_SECOND, settings.SCRAPER_RATE_BURST)
+single_flight = SingleFlight(settings.REDIS_URL, settings.SCRAPER_SINGLE_FLIGHT_LEASE_SECONDS, settings.SCRAPER_SINGLE_FLIGHT_RESULT_TTL)
@@ -1,3 +1,8 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any, Union
 
@@ -6,7 +11,17 @@ from passlib.context import CryptContext
 
 from app.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes below the configured cost are flagged by needs_update and upgraded on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+)
+
+_hash_pool = None
+_hash_pool_pid = None
+_hash_pool_lock = threading.Lock()
 
 ALGORITHM = "HS256"
 
@@ -23,8 +38,33 @@ def create_access_token(
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+def get_hash_pool() -> ProcessPoolExecutor:
+    """Process pool that runs bcrypt off the event loop and threadpool, sized to the cores."""
+    global _hash_pool, _hash_pool_pid
+    if _hash_pool is None or _hash_pool_pid != os.getpid():
+        with _hash_pool_lock:
+            if _hash_pool is None or _hash_pool_pid != os.getpid():
+                _hash_pool = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count(),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                _hash_pool_pid = os.getpid()
+    return _hash_pool
 
-def get_password_hash(password: str) -> str:
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+def get_password_hash(password: str) -> str:
+    return get_hash_pool().submit(_hash, password).result()
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify a password, returning a replacement hash if the stored one uses outdated parameters."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_hash_pool(), _verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_hash_pool(), _hash, password)
@@ -1,5 +1,74 @@
+import time
+
+from celery.signals import task_postrun, task_prerun
+
 from .celery_app import celery
+from .config import settings
+from .database import SessionLocal
+from . import crud, metrics, models
+
+_task_started = {}
+
+@task_prerun.connect
+def _record_task_start(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+@task_postrun.connect
+def _record_task_runtime(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        metrics.record_task_runtime(task.name, time.perf_counter() - started, state or "UNKNOWN")
 
 @celery.task
 def example_task(x, y):
     return x + y
+
+@celery.task(bind=True)
+def run_scraper_step(self, step, payload, enqueued_at=None):
+    """Run one scraper step in the worker, publishing progress as task meta."""
+    started_at = time.time()
+
+    def timing():
+        return {
+            "step": step,
+            "enqueued_at": enqueued_at,
+            "started_at": started_at,
+            "elapsed": time.time() - started_at,
+        }
+
+    def progress(stage, partial=None):
+        self.update_state(state="PROGRESS", meta={**timing(), "stage": stage, "partial": partial})
+
+    from . import scraper
+
+    db = SessionLocal()
+    try:
+        result = scraper.run_step(db, step, payload, progress=progress)
+    finally:
+        db.close()
+    return {**timing(), "stage": "done", "result": result, "finished_at": time.time()}
+
+@celery.task
+def resync_teams():
+    """Queue a roster re-sync for every team imported from a roster page."""
+    db = SessionLocal()
+    try:
+        team_ids = [db_team.id for db_team in crud.get_synced_teams(db)]
+    finally:
+        db.close()
+    for team_id in team_ids:
+        resync_team.delay(team_id)
+    return {"queued": len(team_ids)}
+
+@celery.task(rate_limit=settings.RESYNC_RATE_LIMIT)
+def resync_team(team_id):
+    from . import scraper
+
+    db = SessionLocal()
+    try:
+        db_team = db.get(models.Team, team_id)
+        if db_team is None or not db_team.href:
+            return None
+        return scraper.resync_team(db, db_team)
+    finally:
+        db.close()
@@ -0,0 +1,99 @@
+"""Lookup timings for player_team_association at scale.
+
+Copies the table definition (primary key and indexes included) into a temp
+table, fills it with ``--links`` synthetic rows and times both lookup
+directions plus the idempotent link insert used by roster imports:
+
+    alembic upgrade head
+    python -m benchmarks.bench_association --links 1000000 --output assoc.json
+
+Only the temp table is written, so the real rows are untouched.
+DATABASE_URL must point at a migrated local Postgres.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from benchmarks.bench_scraper import git_commit, summarize
+
+TEAM_SIZE = 20
+
+# name -> (statement, which id range :id is drawn from)
+QUERIES = {
+    "teams_for_player": ("SELECT team_id FROM bench_association WHERE player_id = :id", "players"),
+    "players_for_team": ("SELECT player_id FROM bench_association WHERE team_id = :id", "teams"),
+    # Re-linking a rostered player, as every repeat import of a team does
+    "link_existing": (
+        "INSERT INTO bench_association (player_id, team_id) "
+        f"VALUES (:id, (:id - 1) / {TEAM_SIZE} + 1) ON CONFLICT DO NOTHING",
+        "players",
+    ),
+}
+
+
+def run(links: int, iterations: int) -> dict:
+    from sqlalchemy import text
+
+    from app.database import engine
+
+    players = links // 2
+    teams = links // TEAM_SIZE
+    results = {"links": links, "players": players, "teams": teams, "queries": {}}
+    upper = {"players": players, "teams": teams}
+    with engine.connect() as conn:
+        conn.execute(text("CREATE TEMP TABLE bench_association (LIKE player_team_association INCLUDING ALL)"))
+        # Every player sits on two teams of TEAM_SIZE players each
+        start = time.perf_counter()
+        conn.execute(text("""
+            INSERT INTO bench_association (player_id, team_id)
+            SELECT n % :players + 1, n / :team_size + 1 FROM generate_series(0, :links - 1) AS n
+            ON CONFLICT DO NOTHING
+        """), {"players": players, "team_size": TEAM_SIZE, "links": links})
+        conn.execute(text("ANALYZE bench_association"))
+        results["load_s"] = time.perf_counter() - start
+
+        for name, (sql, id_range) in QUERIES.items():
+            plan = conn.execute(text("EXPLAIN " + sql), {"id": 1}).scalars().all()
+            samples = []
+            for _ in range(iterations):
+                params = {"id": random.randint(1, upper[id_range])}
+                start = time.perf_counter()
+                conn.execute(text(sql), params)
+                samples.append(time.perf_counter() - start)
+            results["queries"][name] = {**summarize(samples), "plan": plan[0].strip()}
+        conn.rollback()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark player_team_association lookups at scale.")
+    parser.add_argument("--links", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = {
+        "benchmark": "association",
+        "commit": git_commit(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "iterations": args.iterations,
+        **run(args.links, args.iterations),
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Cold-start import cost of the API, the Celery worker and the CLI scripts.
+
+Imports each entry module in a fresh ``python -X importtime`` process
+``--runs`` times and reports the median cumulative import time plus the
+heaviest modules it pulled in. Exits non-zero if an entry module loads the
+scraper's dependencies at startup, or takes longer than ``--budget-ms``:
+
+    python -m benchmarks.bench_importtime --runs 5 --output importtime.json
+
+DATABASE_URL must be set (nothing connects to it).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from benchmarks.bench_scraper import git_commit
+
+# Entry module -> what runs it
+TARGETS = {
+    "app.main": "uvicorn app.main:app",
+    "app.tasks": "celery worker (app.celery_app include)",
+    # Imported as a module: the prompts only run under __main__
+    "create_superuser": "python create_superuser.py",
+}
+
+# Loaded on the first scraper request or task, never at startup
+LAZY_MODULES = ("app.scraper", "requests", "lxml")
+
+
+def is_lazy(name: str) -> bool:
+    return any(name == lazy or name.startswith(lazy + ".") for lazy in LAZY_MODULES)
+
+
+def import_profile(module: str) -> dict:
+    """One ``-X importtime`` run: cumulative microseconds per imported module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=os.environ, check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+def run(runs: int, top: int) -> dict:
+    results = {}
+    for module, entry_point in TARGETS.items():
+        profiles = [import_profile(module) for _ in range(runs)]
+        totals = [profile[module] / 1000 for profile in profiles]
+        last = profiles[-1]
+        results[module] = {
+            "entry_point": entry_point,
+            "median_ms": statistics.median(totals),
+            "min_ms": min(totals),
+            "max_ms": max(totals),
+            "modules": len(last),
+            "heaviest": [
+                {"module": name, "cumulative_ms": total / 1000}
+                for name, total in sorted(last.items(), key=lambda item: item[1], reverse=True)[1:top + 1]
+            ],
+            "eager_lazy_modules": sorted(name for name in last if is_lazy(name)),
+        }
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark cold-start import time of the entry modules.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Heaviest imports to list per entry module")
+    parser.add_argument("--budget-ms", type=float, help="Fail if any entry module's median exceeds this")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    targets = run(args.runs, args.top)
+    failed = any(
+        target["eager_lazy_modules"] or (args.budget_ms is not None and target["median_ms"] > args.budget_ms)
+        for target in targets.values()
+    )
+    report = {
+        "benchmark": "importtime",
+        "commit": git_commit(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "runs": args.runs,
+        "budget_ms": args.budget_ms,
+        "targets": targets,
+        "passed": not failed,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Per-step fetch/parse/DB-write timings for the scraper pipeline.
+
+Serves the synthetic fixture pages from a local stub server, runs every wizard step
+against it and writes a JSON report that can be compared across commits:
+
+    alembic upgrade head
+    python -m benchmarks.bench_scraper --iterations 50 --output bench.json
+
+DATABASE_URL must point at a migrated local Postgres; step 6 upserts the
+fixture roster into a team named ``benchmark-team``. Its ``db_write`` rewrites
+every player, because each iteration changes the roster, and
+``db_write_unchanged`` times re-importing that same roster, which the content
+hash turns into a no-op.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from benchmarks import stub_server
+
+STEPS = {
+    1: ("/adult/league/leaguedistrict.aspx", "parse_districts"),
+    2: ("/adult/league/leaguearea.aspx?districtname=Atlanta", "parse_areas"),
+    3: ("/adult/league/leaguegender.aspx?areaname=ALTA", "parse_genders"),
+    4: ("/adult/league/leaguefind.aspx?gender=Women", "parse_flights"),
+    5: ("/adult/league/leagueflight.aspx?flightname=F0", "parse_teams"),
+    6: ("/adult/teamprofile.aspx?teamname=Team%200", "parse_roster"),
+}
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "min_ms": ordered[0] * 1000,
+    }
+
+
+def changed_roster(roster: list, iteration: int) -> list:
+    """``roster`` with every player's content changed from the previous iteration's."""
+    suffix = f" ({iteration % 2})"
+    return [player.model_copy(update={"location": player.location + suffix}) for player in roster]
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(iterations: int, base_url: str) -> dict:
+    from app import scraper
+    from app.scraper import parsers
+    from app.database import SessionLocal
+
+    results = {}
+    db = SessionLocal()
+    try:
+        for step, (href, parser_name) in STEPS.items():
+            parse = getattr(parsers, parser_name)
+            timings = {"fetch": [], "parse": [], "db_write": [], "db_write_unchanged": []}
+            for iteration in range(iterations):
+                start = time.perf_counter()
+                content = scraper.fetch_page(scraper.page_url(href, base_url=base_url))
+                fetched = time.perf_counter()
+                records = parse(content)
+                parsed = time.perf_counter()
+                timings["fetch"].append(fetched - start)
+                timings["parse"].append(parsed - fetched)
+                if step == 6:
+                    roster = scraper.parse_roster(content, gender="Women")
+                    if iteration == 0:
+                        # Start from the unchanged roster, whatever an earlier run left behind
+                        scraper.import_roster(db, team_name="benchmark-team", roster=roster)
+                    roster = changed_roster(roster, iteration)
+                    for timing in ("db_write", "db_write_unchanged"):
+                        start = time.perf_counter()
+                        scraper.import_roster(db, team_name="benchmark-team", roster=roster)
+                        timings[timing].append(time.perf_counter() - start)
+            results[str(step)] = {
+                "records": len(records),
+                "bytes": len(content),
+                **{name: summarize(samples) for name, samples in timings.items() if samples},
+            }
+    finally:
+        db.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper pipeline against the fixture pages.")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    # The stub server is local; the upstream rate limiter would only add sleeps
+    os.environ.setdefault("SCRAPER_RATE_PER_SECOND", "0")
+    server = stub_server.start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        steps = run(args.iterations, base_url)
+    finally:
+        server.shutdown()
+
+    report = {
+        "benchmark": "scraper",
+        "commit": git_commit(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "iterations": args.iterations,
+        "steps": steps,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
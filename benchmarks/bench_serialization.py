@@ -0,0 +1,114 @@
+"""Old vs. projection serialization path for large list responses.
+
+Seeds ``--rows`` players inside a transaction that is rolled back afterwards
+and times building the JSON body for all of them both ways:
+
+- ``orm``: ``select(Player)`` hydrated into ORM objects, validated through
+  the ``PlayerPage`` response model with ``from_attributes`` and encoded with
+  the stdlib ``json`` settings FastAPI's ``JSONResponse`` uses
+- ``projection``: the ``PlayerResponse`` columns fetched as row tuples,
+  turned into dicts and encoded with orjson
+
+    python -m benchmarks.bench_serialization --rows 10000 --output ser.json
+
+DATABASE_URL must point at a migrated local Postgres.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from benchmarks.bench_scraper import git_commit, summarize
+
+SEED = """
+    INSERT INTO players (name, href, location, ntrp, rating, gender, ntrp_value, rating_value, created_at, updated_at)
+    SELECT 'Bench Player ' || n, 'bench-serialization-' || n, 'Atlanta, GA', '3.5C',
+           to_char(3 + n % 10000 / 10000.0, 'FM0.0000'), 'F', 3.5, 3 + n % 10000 / 10000.0, now(), now()
+    FROM generate_series(1, :rows) AS n
+"""
+
+
+def run(rows: int, iterations: int) -> dict:
+    import orjson
+    from pydantic import TypeAdapter
+    from sqlalchemy import select, text
+    from sqlalchemy.orm import Session
+
+    from app import models, projections, schemas
+    from app.database import engine
+
+    page = TypeAdapter(schemas.PlayerPage)
+    seeded = models.Player.href.like("bench-serialization-%")
+
+    def orm_path(conn):
+        start = time.perf_counter()
+        # A fresh session per run so every row is hydrated, as in a request
+        with Session(bind=conn) as db:
+            players = db.scalars(select(models.Player).where(seeded).order_by(models.Player.id)).all()
+            fetched = time.perf_counter()
+            content = page.dump_python(
+                page.validate_python({"items": players, "next_cursor": None}, from_attributes=True), mode="json",
+            )
+            body = json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+        return fetched - start, time.perf_counter() - fetched, len(body)
+
+    def projection_path(conn):
+        start = time.perf_counter()
+        players = projections.as_dicts(conn.execute(
+            select(*projections.PLAYER_COLUMNS).where(seeded).order_by(models.Player.id)
+        ).all())
+        fetched = time.perf_counter()
+        body = orjson.dumps({"items": players, "next_cursor": None})
+        return fetched - start, time.perf_counter() - fetched, len(body)
+
+    results = {}
+    with engine.connect() as conn:
+        conn.execute(text(SEED), {"rows": rows})
+        try:
+            for name, path in (("orm", orm_path), ("projection", projection_path)):
+                path(conn)
+                timings = {"fetch": [], "serialize": [], "total": []}
+                for _ in range(iterations):
+                    fetch, serialize, size = path(conn)
+                    timings["fetch"].append(fetch)
+                    timings["serialize"].append(serialize)
+                    timings["total"].append(fetch + serialize)
+                results[name] = {"bytes": size, **{key: summarize(samples) for key, samples in timings.items()}}
+        finally:
+            conn.rollback()
+
+    results["speedup_p50"] = results["orm"]["total"]["p50_ms"] / results["projection"]["total"]["p50_ms"]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization paths.")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = {
+        "benchmark": "serialization",
+        "commit": git_commit(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "rows": args.rows,
+        "iterations": args.iterations,
+        "paths": run(args.rows, args.iterations),
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
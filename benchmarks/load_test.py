@@ -0,0 +1,254 @@
+"""Closed-loop load test of the auth, user and scraper endpoints.
+
+Starts the app under uvicorn with the scraper pointed at the fixture stub
+server, then for each ``--concurrency`` level runs that many asyncio clients
+for ``--duration`` seconds. Each client loops over a weighted mix of
+``/token``, ``/refresh``, ``/users/me``, ``/users/`` and ``/scraper`` (step 5
+against the stub). The report has throughput plus p50/p95/p99 latency per
+route and level, so the level where throughput stops growing while latency
+climbs is the saturation point:
+
+    python create_superuser.py
+    python -m benchmarks.load_test --email admin@example.com --password secret \\
+        --concurrency 1,8,32,64 --duration 15 --output load.json
+
+The account must be an admin. Pass ``--url`` to target an app that is
+already running, whose SCRAPER_BASE_URL you point somewhere safe yourself.
+DATABASE_URL must point at a migrated local Postgres.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from benchmarks import stub_server
+from benchmarks.bench_scraper import git_commit
+
+DEFAULT_MIX = {"token": 1, "refresh": 1, "me": 5, "users": 2, "scraper": 1}
+
+# The flight fixture; step 5 is never served from the page cache
+FLIGHT_HREF = "/adult/league/leagueflight.aspx?year=2025&flightname=Load"
+
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown route {name!r}; choose from {', '.join(DEFAULT_MIX)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentiles(samples: list[float]) -> dict:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def at(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+    return {"p50_ms": at(0.50), "p95_ms": at(0.95), "p99_ms": at(0.99), "max_ms": ordered[-1] * 1000}
+
+
+class Session:
+    """Tokens shared by the clients; ``/token`` and ``/refresh`` keep them fresh."""
+
+    def __init__(self, email: str, password: str):
+        self.email = email
+        self.password = password
+        self.access_token = None
+        self.refresh_token = None
+
+    async def login(self, client):
+        response = await client.post("/token", data={"username": self.email, "password": self.password})
+        if response.status_code == 200:
+            body = response.json()
+            self.access_token, self.refresh_token = body["access_token"], body["refresh_token"]
+        return response
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+
+async def send(client, session: Session, route: str):
+    if route == "token":
+        return await session.login(client)
+    if route == "refresh":
+        return await client.post("/refresh", json={"refresh_token": session.refresh_token})
+    if route == "me":
+        return await client.get("/users/me", headers=session.headers)
+    if route == "users":
+        return await client.get("/users/", headers=session.headers)
+    return await client.post(
+        "/scraper", json={"step": 5, "payload": {"href": FLIGHT_HREF}}, headers=session.headers,
+    )
+
+
+async def run_level(url: str, session: Session, mix: dict, concurrency: int, duration: float, seed: int) -> dict:
+    import httpx
+
+    latencies = {route: [] for route in mix}
+    errors = {route: 0 for route in mix}
+    routes, weights = list(mix), list(mix.values())
+    deadline = time.perf_counter() + duration
+
+    async def worker(client, rng):
+        while time.perf_counter() < deadline:
+            route = rng.choices(routes, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await send(client, session, route)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies[route].append(time.perf_counter() - start)
+            if not ok:
+                errors[route] += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60.0) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client, random.Random(seed + n)) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    total = sum(len(samples) for samples in latencies.values())
+    return {
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "requests": total,
+        "errors": sum(errors.values()),
+        "throughput_rps": total / elapsed,
+        "routes": {
+            route: {
+                "requests": len(samples),
+                "errors": errors[route],
+                "throughput_rps": len(samples) / elapsed,
+                **percentiles(samples),
+            }
+            for route, samples in latencies.items()
+        },
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_app(upstream: str, workers: int) -> tuple[subprocess.Popen, str]:
+    port = free_port()
+    env = {
+        **os.environ,
+        "SCRAPER_BASE_URL": upstream,
+        # Measure the app, not the politeness delay towards tennisrecord.com
+        "SCRAPER_RATE_PER_SECOND": os.environ.get("SCRAPER_RATE_PER_SECOND", "0"),
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--no-access-log"],
+        env=env,
+    )
+    return process, f"http://127.0.0.1:{port}"
+
+
+async def wait_ready(url: str, timeout: float = 30.0):
+    import httpx
+
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=url) as client:
+        while True:
+            try:
+                if (await client.get("/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            if time.perf_counter() > deadline:
+                raise RuntimeError(f"App at {url} did not come up within {timeout}s")
+            await asyncio.sleep(0.2)
+
+
+async def run(args) -> list[dict]:
+    import httpx
+
+    await wait_ready(args.url)
+    session = Session(args.email, args.password)
+    async with httpx.AsyncClient(base_url=args.url) as client:
+        response = await session.login(client)
+        if response.status_code != 200:
+            raise RuntimeError(f"Login failed with {response.status_code}: {response.text}")
+
+    levels = []
+    for concurrency in args.concurrency:
+        if args.warmup:
+            await run_level(args.url, session, args.mix, concurrency, args.warmup, args.seed)
+        levels.append(await run_level(args.url, session, args.mix, concurrency, args.duration, args.seed))
+    return levels
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test the auth, user and scraper endpoints.")
+    parser.add_argument("--email", required=True, help="Admin account to log in with")
+    parser.add_argument("--password", default=os.environ.get("LOAD_TEST_PASSWORD"),
+                        help="Defaults to LOAD_TEST_PASSWORD")
+    parser.add_argument("--concurrency", type=lambda value: [int(n) for n in value.split(",")], default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each level")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="Route weights, e.g. token=1,refresh=1,me=5,users=2,scraper=1")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the started app")
+    parser.add_argument("--url", help="Target an already running app instead of starting one")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    if not args.password:
+        parser.error("--password or LOAD_TEST_PASSWORD is required")
+
+    server = process = None
+    if args.url is None:
+        server = stub_server.start()
+        process, args.url = start_app(f"http://127.0.0.1:{server.server_port}", args.workers)
+    try:
+        levels = asyncio.run(run(args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+        if server is not None:
+            server.shutdown()
+
+    peak = max(levels, key=lambda level: level["throughput_rps"])
+    report = {
+        "benchmark": "load_test",
+        "commit": git_commit(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "duration_s": args.duration,
+        "workers": args.workers if process is not None else None,
+        "mix": args.mix,
+        "peak": {"concurrency": peak["concurrency"], "throughput_rps": peak["throughput_rps"]},
+        "levels": levels,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
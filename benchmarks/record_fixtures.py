@@ -0,0 +1,56 @@
+"""Replace the synthetic fixture pages with pages recorded from tennisrecord.com.
+
+Starts at the district listing for the given section and follows the first
+link of each step down to a team roster, saving every page under the name the
+stub server expects.
+"""
+import argparse
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app import scraper
+from app.scraper import http_client, parsers
+from benchmarks.stub_server import FIXTURES_DIR, fixture_name
+
+
+def save(url: str, content: bytes, fixtures_dir: str):
+    path = os.path.join(fixtures_dir, fixture_name(url))
+    with open(path, "wb") as f:
+        f.write(content)
+    print(f"Recorded {url} -> {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record tennisrecord.com pages as benchmark fixtures.")
+    parser.add_argument("year")
+    parser.add_argument("lt")
+    parser.add_argument("sectionname")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    args = parser.parse_args()
+
+    page = http_client.fetch(
+        scraper.page_url(scraper.DISTRICTS_PATH),
+        params={"year": args.year, "lt": args.lt, "sectionname": args.sectionname},
+    )
+    save(page.url, page.content, args.fixtures)
+
+    steps = [
+        parsers.parse_districts,
+        parsers.parse_areas,
+        parsers.parse_genders,
+        parsers.parse_flights,
+        parsers.parse_teams,
+    ]
+    for parse in steps:
+        records = parse(page.content)
+        if not records:
+            raise SystemExit(f"{parse.__name__} found nothing to follow on {page.url}")
+        page = http_client.fetch(scraper.page_url(records[0]["href"]))
+        save(page.url, page.content, args.fixtures)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Local stand-in for tennisrecord.com that serves the benchmark fixture pages.
+
+A request for ``/any/path/<page>.aspx?...`` is answered with
+``fixtures/<page>.html``; anything else is a 404. Point the app at it with
+``SCRAPER_BASE_URL=http://127.0.0.1:<port>``.
+
+The checked-in pages are synthetic: hand-built copies of each step's markup
+with made-up names and padding that approximates a real page's size. Replace
+them with real pages with ``python -m benchmarks.record_fixtures``.
+"""
+import argparse
+import os
+import posixpath
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def fixture_name(path: str) -> str:
+    page = posixpath.basename(urlsplit(path).path)
+    return posixpath.splitext(page)[0] + ".html"
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    fixtures_dir = FIXTURES_DIR
+
+    def do_GET(self):
+        path = os.path.join(self.fixtures_dir, fixture_name(self.path))
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        with open(path, "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start(port: int = 0, fixtures_dir: str = FIXTURES_DIR) -> ThreadingHTTPServer:
+    """Serve the fixtures on a background thread and return the server."""
+    handler = type("Handler", (FixtureHandler,), {"fixtures_dir": fixtures_dir})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    args = parser.parse_args()
+
+    server = start(args.port, args.fixtures)
+    print(f"Serving {args.fixtures} on http://127.0.0.1:{server.server_port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
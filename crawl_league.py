@@ -0,0 +1,46 @@
+import argparse
+import logging
+import sys
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+from app.scraper.crawler import crawl_section
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl and import every roster in a league section.")
+    parser.add_argument("year", help="League year, e.g. 2025")
+    parser.add_argument("lt", help="League type as used by tennisrecord.com, e.g. 0")
+    parser.add_argument("sectionname", help="Section name, e.g. 'Southern'")
+    parser.add_argument("--concurrency", type=int, default=4, help="Number of pages fetched in parallel")
+    parser.add_argument(
+        "--rate", type=float, default=None,
+        help="Requests per second per host, replacing SCRAPER_RATE_PER_SECOND; the bucket is shared with the API and workers",
+    )
+    parser.add_argument("--base-url", default=None, help="Upstream base URL (defaults to SCRAPER_BASE_URL)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    stats = crawl_section(
+        args.year,
+        args.lt,
+        args.sectionname,
+        base_url=args.base_url,
+        concurrency=args.concurrency,
+        rate=args.rate,
+    )
+    print(
+        f"Crawled {stats.pages} pages: {stats.districts} districts, {stats.areas} areas, "
+        f"{stats.genders} genders, {stats.flights} flights, {stats.teams} teams, "
+        f"{stats.players} players imported."
+    )
+    if stats.errors:
+        print(f"{len(stats.errors)} errors:")
+        for error in stats.errors:
+            print(f"  {error}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
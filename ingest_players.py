@@ -0,0 +1,37 @@
+import argparse
+import asyncio
+import sys
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+from app.ingest import IngestError, ingest
+
+CHUNK_SIZE = 1 << 20
+
+async def read_chunks(path):
+    with (sys.stdin.buffer if path == "-" else open(path, "rb")) as f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield chunk
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk load players and teams from a CSV or NDJSON file.")
+    parser.add_argument("path", help="File to load, or - for stdin")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default=None, help="Input format (defaults to the file extension)")
+    args = parser.parse_args()
+
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    try:
+        counts = asyncio.run(ingest(read_chunks(args.path), fmt))
+    except IngestError as e:
+        print(f"Import failed: {e}")
+        sys.exit(1)
+    print(
+        f"Received {counts['received']} rows: {counts['inserted']} inserted, {counts['updated']} updated, "
+        f"{counts['unchanged']} unchanged, {counts['duplicates']} duplicates, {counts['rejected']} rejected; "
+        f"{counts['teams_inserted']} teams and {counts['links_inserted']} team links created."
+    )
+
+if __name__ == "__main__":
+    main()
@@ -42,6 +42,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
     )
 
     with context.begin_transaction():
@@ -64,8 +65,12 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
+        # Migrations that build indexes concurrently commit inside an
+        # autocommit block; a transaction per migration records each finished
+        # revision, so a later failure does not roll back the version bump
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            transaction_per_migration=True,
         )
 
         with context.begin_transaction():
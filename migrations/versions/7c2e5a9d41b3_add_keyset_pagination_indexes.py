@@ -0,0 +1,41 @@
+"""add keyset pagination indexes
+
+Revision ID: 7c2e5a9d41b3
+Revises: 50174bf3e143
+Create Date: 2026-10-16 09:12:04.118532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5a9d41b3'
+down_revision: Union[str, Sequence[str], None] = '50174bf3e143'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns); every list filter leads, id follows for the keyset seek
+INDEXES = [
+    ('ix_players_gender_ntrp_id', 'players', ['gender', 'ntrp', 'id']),
+    ('ix_players_ntrp_id', 'players', ['ntrp', 'id']),
+    ('ix_players_location_id', 'players', ['location', 'id']),
+    ('ix_teams_name_id', 'teams', ['name', 'id']),
+    ('ix_player_team_association_team_id_player_id', 'player_team_association', ['team_id', 'player_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build the indexes without blocking writes to the tables
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
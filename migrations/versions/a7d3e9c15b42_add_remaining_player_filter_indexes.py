@@ -0,0 +1,43 @@
+"""add remaining player filter indexes
+
+Revision ID: a7d3e9c15b42
+Revises: f6b1c4e8a203
+Create Date: 2026-10-17 10:21:37.540912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e9c15b42'
+down_revision: Union[str, Sequence[str], None] = 'f6b1c4e8a203'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Together with 7c2e5a9d41b3 every combination of the gender/ntrp/location
+# equality filters has an index with those columns first and id last, so
+# /players/ pages come back in id order without a sort. team_name narrows
+# to one roster through teams.name and (team_id, player_id) instead.
+INDEXES = [
+    ('ix_players_gender_id', 'players', ['gender', 'id']),
+    ('ix_players_gender_location_id', 'players', ['gender', 'location', 'id']),
+    ('ix_players_location_ntrp_id', 'players', ['location', 'ntrp', 'id']),
+    ('ix_players_gender_ntrp_location_id', 'players', ['gender', 'ntrp', 'location', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build the indexes without blocking writes to the tables
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,63 @@
+"""add numeric player ratings
+
+Revision ID: b81f3d6c0a27
+Revises: 7c2e5a9d41b3
+Create Date: 2026-10-16 10:02:37.551904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81f3d6c0a27'
+down_revision: Union[str, Sequence[str], None] = '7c2e5a9d41b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+# Leading number of the display value, e.g. '3.5C' -> 3.5; NULL when there is
+# none or when it rounds to 10 or more and would overflow the column, as in
+# parsers.parse_rating
+BACKFILL = sa.text("""
+    UPDATE players p
+    SET ntrp_value = CASE WHEN round(v.ntrp, 1) < 10 THEN v.ntrp::numeric(2, 1) END,
+        rating_value = CASE WHEN round(v.rating, 4) < 10 THEN v.rating::numeric(5, 4) END
+    FROM (
+        SELECT id,
+            substring(ntrp from '^\\s*(\\d+(?:\\.\\d+)?)')::numeric AS ntrp,
+            substring(rating from '^\\s*(\\d+(?:\\.\\d+)?)')::numeric AS rating
+        FROM players
+        WHERE id > :low AND id <= :high
+    ) v
+    WHERE p.id = v.id
+""")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The autocommit block below commits mid-migration; keep the DDL rerunnable
+    op.add_column('players', sa.Column('ntrp_value', sa.Numeric(2, 1), nullable=True), if_not_exists=True)
+    op.add_column('players', sa.Column('rating_value', sa.Numeric(5, 4), nullable=True), if_not_exists=True)
+
+    # Backfill in id ranges, committing each batch so no lock is held for long
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        max_id = bind.execute(sa.text("SELECT max(id) FROM players")).scalar() or 0
+        for low in range(0, max_id, BATCH_SIZE):
+            bind.execute(BACKFILL, {"low": low, "high": low + BATCH_SIZE})
+        op.create_index(
+            'ix_players_gender_ntrp_value_rating_value', 'players', ['gender', 'ntrp_value', 'rating_value'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_players_gender_ntrp_value_rating_value', table_name='players', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('players', 'rating_value', if_exists=True)
+    op.drop_column('players', 'ntrp_value', if_exists=True)
@@ -0,0 +1,88 @@
+"""make team names unique
+
+Revision ID: c5e1a8d3f920
+Revises: a7d3e9c15b42
+Create Date: 2026-10-17 14:05:12.318840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e1a8d3f920'
+down_revision: Union[str, Sequence[str], None] = 'a7d3e9c15b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Writers are not stopped, so a duplicate team can be created after the
+# merge and fail the concurrent unique build; each retry merges again
+BUILD_ATTEMPTS = 3
+
+# Per name, keep the oldest team that knows its roster page (else the oldest)
+DUPLICATES = """
+    SELECT id, first_value(id) OVER (PARTITION BY name ORDER BY href IS NULL, id) AS keep_id
+    FROM teams WHERE name IS NOT NULL
+"""
+
+MERGE_DUPLICATES = [
+    f"""
+    INSERT INTO player_team_association (player_id, team_id)
+    SELECT a.player_id, d.keep_id
+    FROM player_team_association a JOIN ({DUPLICATES}) d ON d.id = a.team_id
+    WHERE d.id <> d.keep_id
+    ON CONFLICT DO NOTHING
+    """,
+    f"""
+    DELETE FROM player_team_association a USING ({DUPLICATES}) d
+    WHERE a.team_id = d.id AND d.id <> d.keep_id
+    """,
+    f"""
+    DELETE FROM teams t USING ({DUPLICATES}) d
+    WHERE t.id = d.id AND d.id <> d.keep_id
+    """,
+]
+
+
+def _index_is_valid(name: str) -> bool | None:
+    """Whether index ``name`` is usable; None if it does not exist."""
+    return op.get_bind().execute(
+        sa.text("SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"),
+        {"name": name},
+    ).scalar()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Duplicates are merged into one team per name, with their player links,
+    # and the unique index is built alongside ix_teams_name without blocking
+    # writes before it takes over that name
+    with op.get_context().autocommit_block():
+        for attempt in range(1, BUILD_ATTEMPTS + 1):
+            # A failed concurrent build leaves an INVALID index behind that IF NOT EXISTS would keep
+            if _index_is_valid('ix_teams_name_unique') is False:
+                op.drop_index('ix_teams_name_unique', table_name='teams', postgresql_concurrently=True)
+            for statement in MERGE_DUPLICATES:
+                op.execute(statement)
+            try:
+                op.create_index(
+                    'ix_teams_name_unique', 'teams', ['name'],
+                    unique=True, postgresql_concurrently=True, if_not_exists=True,
+                )
+                break
+            except sa.exc.IntegrityError:
+                if attempt == BUILD_ATTEMPTS:
+                    raise
+        op.drop_index(op.f('ix_teams_name'), table_name='teams', postgresql_concurrently=True, if_exists=True)
+    op.execute("ALTER INDEX ix_teams_name_unique RENAME TO ix_teams_name")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Merged duplicates are not restored
+    with op.get_context().autocommit_block():
+        op.create_index('ix_teams_name_plain', 'teams', ['name'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index(op.f('ix_teams_name'), table_name='teams', postgresql_concurrently=True, if_exists=True)
+    op.execute("ALTER INDEX ix_teams_name_plain RENAME TO ix_teams_name")
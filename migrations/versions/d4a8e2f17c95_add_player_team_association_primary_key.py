@@ -0,0 +1,96 @@
+"""add player_team_association primary key
+
+Revision ID: d4a8e2f17c95
+Revises: b81f3d6c0a27
+Create Date: 2026-10-16 11:21:48.730216
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8e2f17c95'
+down_revision: Union[str, Sequence[str], None] = 'b81f3d6c0a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Writers are not stopped, so a duplicate link can be inserted after the
+# dedupe and fail the concurrent unique build; each retry dedupes again
+BUILD_ATTEMPTS = 3
+
+DEDUPE = """
+    DELETE FROM player_team_association a
+    USING player_team_association b
+    WHERE a.player_id = b.player_id AND a.team_id = b.team_id AND a.ctid > b.ctid
+"""
+
+
+def _has_constraint(name: str) -> bool:
+    return op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_constraint WHERE conname = :name"), {"name": name},
+    ).first() is not None
+
+
+def _index_is_valid(name: str) -> bool | None:
+    """Whether index ``name`` is usable; None if it does not exist."""
+    return op.get_bind().execute(
+        sa.text("SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"),
+        {"name": name},
+    ).scalar()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nothing here holds more than a brief lock until the final ALTERs: the
+    # NOT VALID checks reject new NULL links at once, VALIDATE then proves the
+    # existing rows without blocking writes, and the unique index is built
+    # concurrently
+    with op.get_context().autocommit_block():
+        for column in ('player_id', 'team_id'):
+            if not _has_constraint(f'ck_player_team_association_{column}_not_null'):
+                op.execute(
+                    f"ALTER TABLE player_team_association ADD CONSTRAINT ck_player_team_association_{column}_not_null "
+                    f"CHECK ({column} IS NOT NULL) NOT VALID"
+                )
+        op.execute("DELETE FROM player_team_association WHERE player_id IS NULL OR team_id IS NULL")
+        for column in ('player_id', 'team_id'):
+            op.execute(f"ALTER TABLE player_team_association VALIDATE CONSTRAINT ck_player_team_association_{column}_not_null")
+
+        for attempt in range(1, BUILD_ATTEMPTS + 1):
+            # A failed concurrent build leaves an INVALID index behind that IF NOT EXISTS would keep
+            if _index_is_valid('player_team_association_pkey') is False:
+                op.drop_index(
+                    'player_team_association_pkey', table_name='player_team_association', postgresql_concurrently=True,
+                )
+            op.execute(DEDUPE)
+            try:
+                op.create_index(
+                    'player_team_association_pkey', 'player_team_association', ['player_id', 'team_id'],
+                    unique=True, postgresql_concurrently=True, if_not_exists=True,
+                )
+                break
+            except sa.exc.IntegrityError:
+                if attempt == BUILD_ATTEMPTS:
+                    raise
+
+    # The validated checks let SET NOT NULL skip its table scan, so these hold
+    # ACCESS EXCLUSIVE only briefly
+    op.alter_column('player_team_association', 'player_id', existing_type=sa.Integer(), nullable=False)
+    op.alter_column('player_team_association', 'team_id', existing_type=sa.Integer(), nullable=False)
+    for column in ('player_id', 'team_id'):
+        op.drop_constraint(f'ck_player_team_association_{column}_not_null', 'player_team_association', type_='check')
+    op.execute(
+        "ALTER TABLE player_team_association "
+        "ADD CONSTRAINT player_team_association_pkey PRIMARY KEY USING INDEX player_team_association_pkey"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('player_team_association_pkey', 'player_team_association', type_='primary')
+    op.alter_column('player_team_association', 'team_id', existing_type=sa.Integer(), nullable=True)
+    op.alter_column('player_team_association', 'player_id', existing_type=sa.Integer(), nullable=True)
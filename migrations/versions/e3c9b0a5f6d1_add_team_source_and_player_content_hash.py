@@ -0,0 +1,51 @@
+"""add team source and player content hash
+
+Revision ID: e3c9b0a5f6d1
+Revises: d4a8e2f17c95
+Create Date: 2026-10-16 12:40:11.902318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3c9b0a5f6d1'
+down_revision: Union[str, Sequence[str], None] = 'd4a8e2f17c95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+# Same digest as crud.player_content_hash
+BACKFILL = sa.text("""
+    UPDATE players
+    SET content_hash = md5(concat_ws(chr(31), name, location, ntrp, rating))
+    WHERE id > :low AND id <= :high
+""")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The autocommit block below commits mid-migration; keep the DDL rerunnable
+    op.add_column('teams', sa.Column('href', sa.String(), nullable=True), if_not_exists=True)
+    op.add_column('teams', sa.Column('gender', sa.String(), nullable=True), if_not_exists=True)
+    op.add_column('players', sa.Column('content_hash', sa.String(length=32), nullable=True), if_not_exists=True)
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        max_id = bind.execute(sa.text("SELECT max(id) FROM players")).scalar() or 0
+        for low in range(0, max_id, BATCH_SIZE):
+            bind.execute(BACKFILL, {"low": low, "high": low + BATCH_SIZE})
+        op.create_index(op.f('ix_teams_href'), 'teams', ['href'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_teams_href'), table_name='teams', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('players', 'content_hash', if_exists=True)
+    op.drop_column('teams', 'gender', if_exists=True)
+    op.drop_column('teams', 'href', if_exists=True)
@@ -0,0 +1,37 @@
+"""add trigram name search indexes
+
+Revision ID: f6b1c4e8a203
+Revises: e3c9b0a5f6d1
+Create Date: 2026-10-16 14:05:52.417093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b1c4e8a203'
+down_revision: Union[str, Sequence[str], None] = 'e3c9b0a5f6d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for table in ('players', 'teams'):
+            op.create_index(
+                f'ix_{table}_name_trgm', table, ['name'], unique=False,
+                postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in ('teams', 'players'):
+            op.drop_index(f'ix_{table}_name_trgm', table_name=table, postgresql_concurrently=True, if_exists=True)
+    # The extension is left installed; other objects may depend on it
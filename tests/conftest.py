@@ -0,0 +1,143 @@
+"""Shared fixtures.
+
+Tests that touch Postgres use ``TEST_DATABASE_URL``, a dedicated migrated
+database that the tests write to, and are skipped when it is not set or
+cannot be reached. ``DATABASE_URL`` from ``.env`` is never used.
+"""
+import os
+import uuid
+
+import pytest
+from dotenv import load_dotenv
+
+load_dotenv()
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+CONFIGURED_DATABASE_URL = os.environ.get("DATABASE_URL")
+# The app's engines connect lazily, so without a test database nothing reaches the configured one
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL or "postgresql://test-database-not-configured/test"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+# Only the tests that ask for ``fake_redis`` talk to Redis, and none wait on the upstream rate limit
+os.environ.setdefault("REDIS_URL", "")
+os.environ.setdefault("SCRAPER_RATE_PER_SECOND", "0")
+
+from sqlalchemy import delete, event, select, text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from app import crud, models, schemas  # noqa: E402
+from app.database import SessionLocal, async_engine  # noqa: E402
+
+ADMIN = schemas.User(
+    id=0, first_name="test", last_name="admin", email="admin@example.com", role="admin",
+    created_at="1970-01-01T00:00:00", updated_at="1970-01-01T00:00:00",
+)
+
+
+@pytest.fixture
+def admin():
+    return ADMIN
+
+
+@pytest.fixture(scope="session")
+def database():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    if TEST_DATABASE_URL == CONFIGURED_DATABASE_URL:
+        pytest.exit("TEST_DATABASE_URL must not be the DATABASE_URL the app uses", returncode=4)
+    try:
+        with SessionLocal() as db:
+            db.execute(text("SELECT 1"))
+    except OperationalError as e:
+        pytest.skip(f"Postgres is not reachable: {e.orig}")
+
+
+@pytest.fixture
+def db(database):
+    with SessionLocal() as db:
+        yield db
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One client for the whole run, so the asyncpg pool stays on one event loop."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app, get_current_user
+
+    app.dependency_overrides[get_current_user] = lambda: ADMIN
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def statements():
+    """SQL statements the async engine sends while the test runs."""
+    sent = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        sent.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield sent
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Point every sync and asyncio ``Redis.from_url`` at one shared in-memory server."""
+    fakeredis = pytest.importorskip("fakeredis")
+    import redis
+    import redis.asyncio
+
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        redis.Redis, "from_url", classmethod(lambda cls, url, **kwargs: fakeredis.FakeRedis(server=server)),
+    )
+    monkeypatch.setattr(
+        redis.asyncio.Redis, "from_url", classmethod(lambda cls, url, **kwargs: fakeredis.FakeAsyncRedis(server=server)),
+    )
+    return server
+
+
+@pytest.fixture
+def cleanup(db):
+    """Collects player hrefs and team names created by a test and deletes them afterwards."""
+    created = {"hrefs": set(), "teams": set()}
+    yield created
+    db.rollback()
+    player_ids = db.scalars(select(models.Player.id).where(models.Player.href.in_(created["hrefs"]))).all()
+    team_ids = db.scalars(select(models.Team.id).where(models.Team.name.in_(created["teams"]))).all()
+    association = models.player_team_association
+    db.execute(delete(association).where(association.c.player_id.in_(player_ids) | association.c.team_id.in_(team_ids)))
+    db.execute(delete(models.Player).where(models.Player.id.in_(player_ids)))
+    db.execute(delete(models.Team).where(models.Team.id.in_(team_ids)))
+    db.commit()
+
+
+@pytest.fixture
+def make_players(cleanup):
+    """Builds ``count`` players with unique hrefs, deleted after the test."""
+
+    def make(count: int) -> list[schemas.PlayerCreate]:
+        prefix = uuid.uuid4().hex
+        players = [
+            schemas.PlayerCreate(
+                name=f"Player {n}", href=f"/test/{prefix}/{n}", location="Testville, GA", ntrp="3.5C",
+                rating="3.5012", gender="Women", ntrp_value=3.5, rating_value=3.5012,
+            )
+            for n in range(count)
+        ]
+        cleanup["hrefs"].update(player.href for player in players)
+        return players
+
+    return make
+
+
+@pytest.fixture
+def roster(db, cleanup, make_players):
+    """A freshly imported team of five players."""
+    team_name = f"Test Team {uuid.uuid4().hex[:8]}"
+    cleanup["teams"].add(team_name)
+    db_team = crud.create_team(db, schemas.TeamCreate(name=team_name))
+    db_players, _ = crud.upsert_roster(db, db_team, make_players(5))
+    return db_team, db_players
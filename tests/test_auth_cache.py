@@ -0,0 +1,107 @@
+import asyncio
+import time
+
+import pytest
+
+from app.auth_cache import TokenCache
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= deadline:
+            raise AssertionError("Timed out waiting for the invalidation listener")
+        time.sleep(0.01)
+
+
+def cache_user(cache: TokenCache, token: str, exp, user):
+    return cache.put(token, exp, user, cache.generation())
+
+
+@pytest.fixture
+def shared_caches(fake_redis):
+    """Two workers' caches, subscribed to invalidations through fake Redis."""
+    caches = [TokenCache(maxsize=10, ttl=60, redis_url="redis://fake", retry_after=0.1) for _ in range(2)]
+    for cache in caches:
+        cache.generation()
+        wait_for(lambda: cache._trusted)
+    yield caches
+    for cache in caches:
+        cache.close()
+
+
+def test_hit_until_expiry(admin):
+    cache = TokenCache(maxsize=10, ttl=60)
+    cache_user(cache, "token", time.time() + 60, admin)
+    assert cache.get("token") == admin
+    cache_user(cache, "expired", time.time() - 1, admin)
+    assert cache.get("expired") is None
+
+
+def test_evicts_least_recently_used(admin):
+    cache = TokenCache(maxsize=2, ttl=60)
+    cache_user(cache, "a", None, admin)
+    cache_user(cache, "b", None, admin)
+    cache.get("a")
+    cache_user(cache, "c", None, admin)
+    assert cache.get("b") is None
+    assert cache.get("a") == admin
+
+
+def test_user_read_before_an_invalidation_is_not_cached(admin):
+    cache = TokenCache(maxsize=10, ttl=60)
+    generation = cache.generation()
+    asyncio.run(cache.invalidate_user(admin.id))
+    cache.put("token", None, admin, generation)
+    assert cache.get("token") is None
+
+
+def test_invalidation_reaches_other_workers(shared_caches, admin):
+    first, second = shared_caches
+    cache_user(first, "token", None, admin)
+    cache_user(second, "token", None, admin)
+
+    asyncio.run(first.invalidate_user(admin.id))
+    assert first.get("token") is None
+    wait_for(lambda: second.get("token") is None)
+
+    # Entries cached after the change are served again
+    cache_user(second, "token", None, admin)
+    assert second.get("token") == admin
+
+
+def test_bypassed_while_redis_is_down(shared_caches, fake_redis, admin):
+    cache, _ = shared_caches
+    cache_user(cache, "token", None, admin)
+    fake_redis.connected = False
+    wait_for(lambda: cache.get("token") is None)
+    cache_user(cache, "token", None, admin)
+    assert cache.get("token") is None
+
+    fake_redis.connected = True
+    wait_for(lambda: cache._trusted)
+    cache_user(cache, "token", None, admin)
+    assert cache.get("token") == admin
+
+
+def test_login_rehash_invalidates_cached_user(client, db):
+    from passlib.hash import bcrypt
+
+    from app import models
+    from app.auth_cache import token_cache
+
+    # Below BCRYPT_ROUNDS, so logging in upgrades the hash
+    db_user = models.User(
+        email=f"rehash-{time.time_ns()}@example.com", hashed_password=bcrypt.using(rounds=4).hash("secret"),
+        first_name="Re", last_name="Hash", role="user",
+    )
+    db.add(db_user)
+    db.commit()
+    try:
+        cache_user(token_cache, "rehash-token", None, db_user)
+        response = client.post("/token", data={"username": db_user.email, "password": "secret"})
+        assert response.status_code == 200
+        assert token_cache.get("rehash-token") is None
+    finally:
+        db.delete(db_user)
+        db.commit()
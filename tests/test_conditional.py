@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from starlette.requests import Request
+
+from app import conditional, models
+
+UPDATED_AT = datetime(2025, 3, 1, 12, 30, 15, 123456)
+
+
+def request(**headers) -> Request:
+    return Request({
+        "type": "http",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_if_none_match_matches_weak_etag():
+    validator = conditional.Validator.build(UPDATED_AT, 3)
+    assert conditional.is_fresh(request(if_none_match=validator.etag), validator)
+    assert conditional.is_fresh(request(if_none_match=validator.etag[2:]), validator)
+    assert not conditional.is_fresh(request(if_none_match='W/"other"'), validator)
+
+
+def test_etag_covers_parts():
+    assert conditional.Validator.build(UPDATED_AT, 3).etag != conditional.Validator.build(UPDATED_AT, 2).etag
+
+
+def test_if_modified_since():
+    validator = conditional.Validator.build(UPDATED_AT)
+    since = UPDATED_AT.replace(tzinfo=timezone.utc)
+    assert conditional.is_fresh(request(if_modified_since=format_datetime(since, usegmt=True)), validator)
+    earlier = since - timedelta(seconds=1)
+    assert not conditional.is_fresh(request(if_modified_since=format_datetime(earlier, usegmt=True)), validator)
+
+
+def test_zoneless_if_modified_since_is_utc():
+    # "-0000" parses to a naive datetime, which used to raise TypeError on comparison
+    validator = conditional.Validator.build(UPDATED_AT)
+    assert conditional.is_fresh(request(if_modified_since="Sat, 01 Mar 2025 12:30:15 -0000"), validator)
+    assert not conditional.is_fresh(request(if_modified_since="Sat, 01 Mar 2025 12:30:14 -0000"), validator)
+
+
+def test_unparseable_if_modified_since_is_stale():
+    validator = conditional.Validator.build(UPDATED_AT)
+    assert not conditional.is_fresh(request(if_modified_since="yesterday"), validator)
+
+
+def test_undated_validator_ignores_if_modified_since():
+    validator = conditional.Validator.build(UPDATED_AT, 3, dated=False)
+    assert "Last-Modified" not in validator.headers
+    assert not conditional.is_fresh(request(if_modified_since="Fri, 01 Jan 2100 00:00:00 GMT"), validator)
+    assert conditional.is_fresh(request(if_none_match=validator.etag), validator)
+
+
+def test_page_is_validated_by_etag_only(client, roster):
+    db_team, _ = roster
+    url = f"/players/?team_name={db_team.name}"
+    response = client.get(url)
+    assert response.status_code == 200
+    assert "last-modified" not in response.headers
+
+    assert client.get(url, headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+    # Unlinking a player bumps no updated_at, so a date can never prove a page fresh
+    assert client.get(url, headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}).status_code == 200
+
+
+def test_page_etag_changes_when_a_player_leaves(client, db, roster):
+    db_team, db_players = roster
+    url = f"/players/?team_name={db_team.name}"
+    etag = client.get(url).headers["etag"]
+
+    association = models.player_team_association
+    db.execute(association.delete().where(
+        (association.c.team_id == db_team.id) & (association.c.player_id == db_players[0].id)
+    ))
+    db.commit()
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == len(db_players) - 1
+
+
+def test_team_detail_changes_when_a_player_leaves(client, db, roster):
+    db_team, db_players = roster
+    url = f"/teams/{db_team.id}"
+    response = client.get(url)
+    assert "last-modified" not in response.headers
+
+    association = models.player_team_association
+    db.execute(association.delete().where(association.c.player_id == db_players[0].id))
+    db.commit()
+    assert client.get(url, headers={"If-None-Match": response.headers["etag"]}).status_code == 200
+
+
+def test_zoneless_if_modified_since_on_a_dated_endpoint(client):
+    # The test user was last updated in 1970
+    response = client.get("/users/me", headers={"If-Modified-Since": "Sat, 01 Mar 2025 12:30:15 -0000"})
+    assert response.status_code == 304
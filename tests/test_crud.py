@@ -0,0 +1,51 @@
+from sqlalchemy import func, select
+
+from app import crud, models, schemas
+
+
+def as_created(db_players) -> list[schemas.PlayerCreate]:
+    return [schemas.PlayerCreate.model_validate(player, from_attributes=True) for player in db_players]
+
+
+def stored(db, players) -> dict:
+    stmt = select(models.Player).where(models.Player.href.in_([player.href for player in players]))
+    return {row.href: row for row in db.scalars(stmt.execution_options(populate_existing=True))}
+
+
+def test_upsert_roster_skips_unchanged_players(db, roster, make_players):
+    db_team, db_players = roster
+    players = as_created(db_players)
+    before = {href: row.updated_at for href, row in stored(db, players).items()}
+
+    again, written = crud.upsert_roster(db, db_team, players)
+    assert written == 0
+    assert [player.id for player in again] == [player.id for player in db_players]
+
+    players[1] = players[1].model_copy(update={"rating": "3.6001", "rating_value": 3.6001})
+    new = make_players(1)
+    again, written = crud.upsert_roster(db, db_team, players + new)
+    assert written == 2
+    assert [player.href for player in again] == [player.href for player in players + new]
+
+    after = stored(db, players)
+    assert after[players[1].href].rating == "3.6001"
+    assert after[players[1].href].content_hash == crud.player_content_hash(players[1].model_dump())
+    assert after[players[1].href].updated_at > before[players[1].href]
+    assert after[players[0].href].updated_at == before[players[0].href]
+
+
+def test_upsert_roster_links_players_once(db, roster):
+    db_team, db_players = roster
+    players = as_created(db_players)
+    crud.upsert_roster(db, db_team, players + players[:2])
+    association = models.player_team_association
+    assert db.scalar(select(func.count()).where(association.c.team_id == db_team.id)) == len(players)
+
+
+def test_upsert_roster_writes_a_gender_change(db, roster):
+    db_team, db_players = roster
+    players = as_created(db_players)
+    players[0] = players[0].model_copy(update={"gender": "Men"})
+    _, written = crud.upsert_roster(db, db_team, players)
+    assert written == 1
+    assert stored(db, players)[players[0].href].gender == "Men"
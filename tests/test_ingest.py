@@ -0,0 +1,111 @@
+import uuid
+
+
+def upload(client, cleanup, rows: list[str], team_name: str | None = None):
+    if team_name:
+        cleanup["teams"].add(team_name)
+    body = "name,href,location,ntrp,rating,gender,team_name,team_href\n" + "\n".join(rows) + "\n"
+    return client.post("/players/import?format=csv", content=body.encode())
+
+
+def test_imports_players_and_links_teams(client, cleanup):
+    prefix, team_name = uuid.uuid4().hex, f"Ingest {uuid.uuid4().hex[:8]}"
+    hrefs = [f"/test/{prefix}/{n}" for n in range(3)]
+    cleanup["hrefs"].update(hrefs)
+    rows = [f"Player {n},{href},Testville GA,3.5C,3.5012,Women,{team_name}," for n, href in enumerate(hrefs)]
+
+    response = upload(client, cleanup, rows + rows[:1], team_name)
+    assert response.status_code == 200
+    assert response.json() == {
+        "received": 4, "inserted": 3, "updated": 0, "unchanged": 0, "duplicates": 1, "rejected": 0,
+        "teams_inserted": 1, "links_inserted": 3,
+    }
+
+    response = upload(client, cleanup, rows, team_name)
+    assert response.json()["unchanged"] == 3
+    assert response.json()["links_inserted"] == 0
+
+
+def test_rejects_values_that_overflow_once_rounded(client, cleanup):
+    prefix = uuid.uuid4().hex
+    hrefs = [f"/test/{prefix}/{n}" for n in range(4)]
+    cleanup["hrefs"].update(hrefs)
+    rows = [
+        f"Fits,{hrefs[0]},Testville GA,9.94C,9.99994,Women,,",
+        # numeric(2,1) and numeric(5,4) round these up to 10
+        f"Ntrp,{hrefs[1]},Testville GA,9.96C,3.5,Women,,",
+        f"Rating,{hrefs[2]},Testville GA,3.5C,9.99996,Women,,",
+        f",{hrefs[3]},Testville GA,3.5C,3.5,Women,,",
+    ]
+    response = upload(client, cleanup, rows)
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 1
+    assert response.json()["rejected"] == 3
+
+
+def test_unreadable_upload_is_a_bad_request(client, cleanup):
+    response = client.post("/players/import?format=csv", content=b"name,unknown\nx,y\n")
+    assert response.status_code == 400
+
+
+def test_malformed_rows_are_rejected_not_fatal(client, cleanup):
+    prefix = uuid.uuid4().hex
+    hrefs = [f"/test/{prefix}/{n}" for n in range(3)]
+    cleanup["hrefs"].update(hrefs)
+    rows = [
+        f'Player 0,{hrefs[0]},"Testville,\nGA",3.5C,3.5012,Women,,',
+        "Too,few,columns",
+        f'Bad "quote",{hrefs[1]},Testville GA,3.5C,3.5012,Women,"x"y,',
+        f"Player 2,{hrefs[2]},Testville GA,3.5C,3.5012,Women,,",
+    ]
+    response = upload(client, cleanup, rows)
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 2
+    assert response.json()["rejected"] == 2
+
+
+def test_new_team_takes_its_last_row(client, db, cleanup):
+    from app import models
+
+    prefix, team_name = uuid.uuid4().hex, f"Ingest {uuid.uuid4().hex[:8]}"
+    hrefs = [f"/test/{prefix}/{n}" for n in range(3)]
+    cleanup["hrefs"].update(hrefs)
+    rows = [
+        f"Player {n},{href},Testville GA,3.5C,3.5012,Women,{team_name},/team/{n}" for n, href in enumerate(hrefs)
+    ]
+    response = upload(client, cleanup, rows, team_name)
+    assert response.json()["teams_inserted"] == 1
+    assert db.query(models.Team.href).filter(models.Team.name == team_name).scalar() == "/team/2"
+
+    # An existing team is linked, not duplicated
+    response = upload(client, cleanup, rows, team_name)
+    assert response.json()["teams_inserted"] == 0
+    assert db.query(models.Team).filter(models.Team.name == team_name).count() == 1
+
+
+def test_player_on_two_teams_is_linked_to_both(client, cleanup):
+    href, teams = f"/test/{uuid.uuid4().hex}/0", [f"Ingest {uuid.uuid4().hex[:8]}" for _ in range(2)]
+    cleanup["hrefs"].add(href)
+    cleanup["teams"].update(teams)
+    rows = [f"Player,{href},Testville GA,3.5C,3.5012,Women,{team_name}," for team_name in teams]
+
+    response = upload(client, cleanup, rows)
+    assert response.status_code == 200
+    assert response.json() == {
+        "received": 2, "inserted": 1, "updated": 0, "unchanged": 0, "duplicates": 1, "rejected": 0,
+        "teams_inserted": 2, "links_inserted": 2,
+    }
+
+
+def test_non_utf8_header_is_a_bad_request(client, cleanup):
+    response = client.post("/players/import?format=csv", content=b"name,href,\xff\n")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "CSV header is not UTF-8"
+
+
+def test_gender_change_is_an_update(client, cleanup):
+    href = f"/test/{uuid.uuid4().hex}/0"
+    cleanup["hrefs"].add(href)
+    upload(client, cleanup, [f"Player,{href},Testville GA,3.5C,3.5012,Women,,"])
+    response = upload(client, cleanup, [f"Player,{href},Testville GA,3.5C,3.5012,Men,,"])
+    assert response.json()["updated"] == 1
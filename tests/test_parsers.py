@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from app.scraper import parsers
+from benchmarks.stub_server import FIXTURES_DIR
+
+
+def fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, f"{name}.html"), "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("parse, page, count, first", [
+    (parsers.parse_districts, "leaguedistrict", 5, {
+        "text": "Atlanta",
+        "href": "/adult/league/leaguearea.aspx?year=2025&lt=0&sectionname=Southern&districtname=Atlanta",
+    }),
+    (parsers.parse_areas, "leaguearea", 4, {
+        "text": "ALTA",
+        "href": "/adult/league/leaguegender.aspx?year=2025&lt=0&sectionname=Southern&districtname=Atlanta&areaname=ALTA",
+    }),
+    (parsers.parse_genders, "leaguegender", 3, {
+        "text": "Men",
+        "href": "/adult/league/leaguefind.aspx?year=2025&lt=0&sectionname=Southern&areaname=ALTA&gender=Men",
+    }),
+    (parsers.parse_flights, "leaguefind", 40, {
+        "league_name": "ALTA 2025 Spring A-0", "flight": "A1", "sub_flight": "0", "teams": "8",
+        "href": "/adult/league/leagueflight.aspx?year=2025&lt=0&sectionname=Southern&flightname=F0",
+    }),
+    (parsers.parse_teams, "leagueflight", 12, {
+        "team_name": "Smyrna Team 0", "players": "12", "top_5_rating": "3.400", "team_rating": "3.300",
+        "court_rating": "3.200", "href": "/adult/teamprofile.aspx?year=2025&teamname=Team%200",
+    }),
+    (parsers.parse_roster, "teamprofile", 40, {
+        "name": "Mary Williams", "href": "/adult/profile.aspx?playername=Mary%20Williams&s=0",
+        "location": "Duluth, GA", "ntrp": "3.5C", "rating": "3.5632", "ntrp_value": 3.5, "rating_value": 3.5632,
+    }),
+])
+def test_parses_fixture_page(parse, page, count, first):
+    rows = parse(fixture(page))
+    assert len(rows) == count
+    assert rows[0] == first
+
+
+def test_unrelated_page_parses_empty():
+    assert parsers.parse_teams(fixture("leaguedistrict")) == []
+    assert parsers.parse_roster(fixture("leagueflight")) == []
+
+
+@pytest.mark.parametrize("text, number", [("3.5C", 3.5), (" 3.4012 ", 3.4012), ("4", 4.0), ("-", None), ("", None)])
+def test_parse_number(text, number):
+    assert parsers.parse_number(text) == number
+
+
+@pytest.mark.parametrize("text, places, number", [
+    ("3.5C", 1, 3.5), ("9.94C", 1, 9.94), ("9.95C", 1, None), ("12.0", 1, None),
+    ("9.99994", 4, 9.99994), ("9.99995", 4, None), ("-", 4, None),
+])
+def test_parse_rating_drops_values_that_overflow(text, places, number):
+    assert parsers.parse_rating(text, places) == number
@@ -0,0 +1,27 @@
+"""SQL statement counts for the relationship read endpoints.
+
+Authentication is overridden, so the counts cover only the endpoint itself.
+"""
+import pytest
+
+# Statements allowed per request: the conditional GET version lookup, the
+# parent row and one selectin load
+BUDGETS = {
+    "/teams/{team_id}": 3,
+    "/players/{player_id}": 3,
+}
+
+
+@pytest.mark.parametrize("route", BUDGETS)
+def test_detail_endpoint_statement_budget(client, statements, roster, route):
+    db_team, db_players = roster
+    url = route.format(team_id=db_team.id, player_id=db_players[0].id)
+    # Warm the pool so connection setup queries are not counted
+    client.get(url)
+    statements.clear()
+
+    response = client.get(url)
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body.get("players", body.get("teams", []))) == (len(db_players) if "teams/" in route else 1)
+    assert len(statements) <= BUDGETS[route], statements
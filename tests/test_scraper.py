@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from app.config import settings
+from benchmarks import stub_server
+
+FLIGHT_HREF = "/adult/league/leagueflight.aspx?year=2025&flightname=Test"
+
+
+@pytest.fixture(scope="module")
+def upstream():
+    """The synthetic fixture pages in place of tennisrecord.com."""
+    server = stub_server.start()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(settings, "SCRAPER_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+        yield server
+    server.shutdown()
+
+
+def test_streams_step_5_as_ndjson(client, upstream):
+    response = client.post("/scraper?stream=ndjson", json={"step": 5, "payload": {"href": FLIGHT_HREF}})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["event"] for event in events] == ["team"] * 12 + ["summary"]
+    assert events[-1]["data"]["teams"] == 12
+
+
+def test_streams_step_5_as_sse(client, upstream):
+    response = client.post("/scraper?stream=sse", json={"step": 5, "payload": {"href": FLIGHT_HREF}})
+    assert response.status_code == 200
+    assert response.text.count("event: team\n") == 12
+    assert response.text.endswith("\n\n")
+
+
+def test_stream_fetch_error_is_a_bad_request(client, upstream):
+    # Reported before the response starts, not as a 200 with an error event
+    response = client.post("/scraper?stream=ndjson", json={"step": 5, "payload": {"href": "/adult/missing.aspx"}})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Could not fetch URL")
+
+
+@pytest.mark.parametrize("step, payload", [(5, {}), (6, {"href": FLIGHT_HREF, "gender": "Women"}), (4, {"href": FLIGHT_HREF})])
+def test_stream_invalid_payload_is_a_bad_request(client, upstream, step, payload):
+    response = client.post("/scraper?stream=ndjson", json={"step": step, "payload": payload})
+    assert response.status_code == 400
+
+
+def test_streams_step_6_roster(client, upstream, cleanup):
+    team_name = "Streamed Team"
+    cleanup["teams"].add(team_name)
+    payload = {"href": "/adult/teamprofile.aspx?teamname=Streamed", "gender": "Women", "team_name": team_name}
+    response = client.post("/scraper?stream=ndjson", json={"step": 6, "payload": payload})
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    players = [event["data"] for event in events if event["event"] == "player"]
+    cleanup["hrefs"].update(player["href"] for player in players)
+    summary = events[-1]["data"]
+    assert summary["parsed"] == len(players) == 40
+    assert summary["written"] + summary["unchanged"] == 40
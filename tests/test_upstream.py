@@ -0,0 +1,112 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from app.scraper.upstream import CoalescedFetchError, RateLimiter, SingleFlight
+
+KEY = "http://upstream.test/page"
+
+
+def wait_for_waiter(flight: SingleFlight, timeout: float = 5.0):
+    """Block until another caller is subscribed to ``KEY``'s flight."""
+    if flight._redis is None:
+        # A local waiter blocks on an Event, which cannot be observed; give it time to get there
+        time.sleep(0.1)
+        return
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if dict(flight._redis.pubsub_numsub(flight.prefix + KEY)).get((flight.prefix + KEY).encode()):
+            return
+        time.sleep(0.01)
+    raise AssertionError("No caller joined the flight")
+
+
+def run_flight(leader: SingleFlight, waiter: SingleFlight, outcome):
+    """Start a flight on ``leader``, join it from ``waiter``, then finish it with ``outcome()``.
+
+    Returns both callers' futures.
+    """
+    started, release = threading.Event(), threading.Event()
+
+    def fetch():
+        started.set()
+        release.wait(5)
+        return outcome()
+
+    def unexpected_fetch():
+        raise AssertionError("The waiter fetched instead of sharing the leader's result")
+
+    with ThreadPoolExecutor(2) as pool:
+        led = pool.submit(leader.do, KEY, fetch)
+        started.wait(5)
+        waited = pool.submit(waiter.do, KEY, unexpected_fetch)
+        wait_for_waiter(leader)
+        release.set()
+    return led, waited
+
+
+@pytest.fixture(params=["redis", "local"])
+def flights(request, fake_redis):
+    """Two workers' SingleFlight, sharing fake Redis or, locally, one instance."""
+    if request.param == "local":
+        flight = SingleFlight(None, lease=5.0, result_ttl=10)
+        return flight, flight
+    return SingleFlight("redis://fake", lease=5.0, result_ttl=10), SingleFlight("redis://fake", lease=5.0, result_ttl=10)
+
+
+def test_concurrent_fetches_share_one_result(flights):
+    led, waited = run_flight(*flights, lambda: b"content")
+    assert led.result(5) == (b"content", False)
+    assert waited.result(5) == (b"content", True)
+
+
+def test_failed_fetch_fans_out(flights):
+    def fail():
+        raise requests.exceptions.ConnectionError("upstream down")
+
+    led, waited = run_flight(*flights, fail)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        led.result(5)
+    with pytest.raises(CoalescedFetchError, match="upstream down"):
+        waited.result(5)
+
+
+def test_waiter_never_reads_an_earlier_flight(fake_redis):
+    leader = SingleFlight("redis://fake", lease=5.0, result_ttl=10)
+    waiter = SingleFlight("redis://fake", lease=5.0, result_ttl=10)
+
+    def failing():
+        raise requests.exceptions.ConnectionError("first flight failed")
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        leader.do(KEY, failing)
+
+    # The first flight's error is still readable, but the next flight must not see it
+    led, waited = run_flight(leader, waiter, lambda: b"fresh")
+    assert led.result(5) == (b"fresh", False)
+    assert waited.result(5) == (b"fresh", True)
+
+
+def test_falls_back_to_local_flights_without_redis(fake_redis):
+    flight = SingleFlight("redis://fake", lease=5.0, result_ttl=10)
+    fake_redis.connected = False
+    assert flight.do(KEY, lambda: b"content") == (b"content", False)
+    assert flight._backend() is None
+
+
+def test_rate_limiter_shares_the_bucket_across_workers(fake_redis):
+    first = RateLimiter("redis://fake", rate=1.0, burst=2)
+    second = RateLimiter("redis://fake", rate=1.0, burst=2)
+    assert first.reserve("upstream.test") == 0
+    assert second.reserve("upstream.test") == 0
+    # The burst is spent, so the next caller queues behind both
+    assert second.reserve("upstream.test") == pytest.approx(1.0, abs=0.1)
+    assert first.reserve("other.test") == 0
+
+
+def test_rate_limiter_disabled_at_zero_rate(fake_redis):
+    limiter = RateLimiter("redis://fake", rate=0, burst=1)
+    assert [limiter.reserve("upstream.test") for _ in range(3)] == [0, 0, 0]